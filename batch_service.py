@@ -5,30 +5,98 @@ Supports img2dataset format with parquet metadata from both S3 and local filesys
 
 import argparse
 import io
-import json
+import logging
 import os
+import queue
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import boto3
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import ray
 import torch
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 from PIL import Image
-from tqdm import tqdm
+from pyarrow import fs as pafs
+from ray.util import ActorPool
+from torchvision.io import ImageReadMode, decode_jpeg
+from torchvision.transforms.functional import pil_to_tensor
 
 from engine.config import load_config
+from engine.exceptions import InvalidImageError
 from engine.loader import load_model, validate_model_interface
 from engine.logging import get_logger, setup_logging
 from engine.metrics import MetricsCollector
+from engine.preprocess import crop_images
 from engine.utils import decode_image
 
 
 logger = get_logger(__name__)
 
+# Maximum number of concurrent ranged GETs issued for a single shard.
+S3_RANGE_CONCURRENCY = 8
+
+# Number of rows decoded at a time when streaming a parquet shard.
+PARQUET_READ_BATCH_SIZE = 4096
+
+# Columns mapped to top-level sample fields; all others become metadata.
+SAMPLE_COLUMNS = ("url", "caption", "key")
+
+# Image URLs with this suffix hold pre-decoded HWC uint8 arrays, which bypass
+# image decoding entirely.
+RAW_IMAGE_SUFFIX = ".npy"
+
+# JPEG start-of-image marker, used to route images to the nvJPEG decoder.
+JPEG_MAGIC = b"\xff\xd8\xff"
+
+# Minimum size of the S3 client connection pool; image fetches are many small
+# GETs issued concurrently, so the botocore default of 10 is far too low.
+S3_MAX_POOL_CONNECTIONS = 128
+
+# Default number of threads fetching image bytes concurrently.
+IMAGE_FETCH_THREADS = 64
+
+# Batches queued on each worker at once, so a worker never idles waiting for
+# the driver to submit its next batch. Workers run this many batches
+# concurrently: one decodes while another holds the model.
+TASKS_PER_WORKER = 2
+
+# Seconds between progress log lines during a run
+PROGRESS_LOG_INTERVAL_S = 30.0
+
+# Number of results accumulated before they are appended to the output
+# parquet file as a row group.
+OUTPUT_ROW_GROUP_SIZE = 8192
+
+# Maximum number of rows held back before opening the output parquet file
+# while a metadata column has only been seen as all-null (its type unknown).
+OUTPUT_SCHEMA_BUFFER_ROWS = 4 * OUTPUT_ROW_GROUP_SIZE
+
+# Number of S3 prefix partitions listed concurrently.
+S3_LIST_THREADS = 16
+
+# Compression codec for parquet output.
+PARQUET_COMPRESSION = "zstd"
+
+# Storage types for output embeddings. int8 embeddings are scaled per vector
+# (symmetric, max-abs / 127) and the scale is stored in `embedding_scale`.
+EMBEDDING_DTYPES = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+
 
 class UnifiedDataLoader:
     """Unified data loader supporting both S3 and local filesystem."""
@@ -39,6 +107,10 @@ class UnifiedDataLoader:
         aws_access_key: Optional[str] = None,
         aws_secret_key: Optional[str] = None,
         aws_region: Optional[str] = None,
+        prefetch_depth: int = 4,
+        shard_cache: Optional[str] = None,
+        metadata_columns: Optional[List[str]] = None,
+        fetch_threads: int = IMAGE_FETCH_THREADS,
     ):
         """Initialize unified data loader.
 
@@ -47,9 +119,27 @@ class UnifiedDataLoader:
             aws_access_key: AWS access key (or from env)
             aws_secret_key: AWS secret key (or from env)
             aws_region: AWS region (default: us-east-1)
+            prefetch_depth: Number of shards whose first row group is read
+                ahead of iteration
+            shard_cache: Optional local JSON file caching the shard list
+            metadata_columns: Metadata columns to read (None = all); other
+                columns are never fetched
+            fetch_threads: Number of threads that will fetch images through
+                this loader; sizes the S3 connection pool
         """
         self.input_dir = input_dir
+        self.shard_cache = shard_cache
+        self.metadata_columns = (
+            set(metadata_columns) if metadata_columns is not None else None
+        )
         self.is_s3 = input_dir.startswith("s3://")
+        self.prefetch_depth = max(1, prefetch_depth)
+
+        # Shards are fetched and parsed in the background while the caller
+        # consumes the current one
+        self._shard_executor = ThreadPoolExecutor(
+            max_workers=self.prefetch_depth, thread_name_prefix="shard-prefetch"
+        )
 
         if self.is_s3:
             # Parse S3 URL
@@ -65,8 +155,40 @@ class UnifiedDataLoader:
                     "aws_secret_access_key": aws_secret_key,
                 }
 
+            # A single client is shared by the listing and image fetch threads
+            # (boto3 clients are thread-safe); size its connection pool so no
+            # thread waits for a connection, keep idle connections alive and
+            # back off adaptively on throttling. Images are small objects, so
+            # plain GETs beat transfer managers that HEAD every object first
             self.s3_client = boto3.client(
-                "s3", region_name=aws_region or "us-east-1", **session_kwargs
+                "s3",
+                region_name=aws_region or "us-east-1",
+                config=BotoConfig(
+                    max_pool_connections=max(
+                        S3_MAX_POOL_CONNECTIONS, fetch_threads + S3_LIST_THREADS
+                    ),
+                    tcp_keepalive=True,
+                    retries={"mode": "adaptive"},
+                ),
+                **session_kwargs,
+            )
+
+            # Shards are read through Arrow's S3 filesystem, which fetches the
+            # footer and then only the needed column chunks as coalesced
+            # ranged GETs on Arrow's IO pool
+            self.s3_fs = pafs.S3FileSystem(
+                region=aws_region or "us-east-1",
+                access_key=aws_access_key if aws_secret_key else None,
+                secret_key=aws_secret_key if aws_access_key else None,
+                # Follow boto3's endpoint environment variables so both
+                # clients talk to the same (possibly S3-compatible) service
+                endpoint_override=(
+                    os.environ.get("AWS_ENDPOINT_URL_S3")
+                    or os.environ.get("AWS_ENDPOINT_URL")
+                ),
+            )
+            pa.set_io_thread_count(
+                max(pa.io_thread_count(), self.prefetch_depth * S3_RANGE_CONCURRENCY)
             )
 
             logger.info(f"S3 mode: s3://{self.s3_bucket}/{self.s3_prefix}")
@@ -81,29 +203,24 @@ class UnifiedDataLoader:
     def list_shards(self) -> List[str]:
         """List all parquet shards.
 
+        If a shard cache file was given and holds a listing for this input
+        directory, it is returned without listing the input again.
+
         Returns:
             List of shard paths (S3 keys or local paths)
         """
+        cached = self._read_shard_cache()
+        if cached is not None:
+            logger.info(f"Loaded {len(cached)} parquet shards from {self.shard_cache}")
+            return cached
+
         shards = []
 
         if self.is_s3:
             # S3 mode
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-
             try:
-                for page in paginator.paginate(
-                    Bucket=self.s3_bucket, Prefix=self.s3_prefix
-                ):
-                    if "Contents" not in page:
-                        continue
-
-                    for obj in page["Contents"]:
-                        key = obj["Key"]
-                        if key.endswith(".parquet"):
-                            shards.append(key)
-
+                shards = self._list_s3_shards()
                 logger.info(f"Found {len(shards)} parquet shards in S3")
-                return sorted(shards)
 
             except ClientError as e:
                 logger.error(f"Failed to list S3 objects: {e}")
@@ -114,68 +231,371 @@ class UnifiedDataLoader:
                 shards.append(str(parquet_file))
 
             logger.info(f"Found {len(shards)} parquet shards locally")
-            return sorted(shards)
 
-    def load_shard(self, shard_path: str) -> pd.DataFrame:
-        """Load a parquet shard.
+        shards = sorted(shards)
+        self._write_shard_cache(shards)
+        return shards
+
+    def _list_s3_shards(self) -> List[str]:
+        """List parquet keys under the S3 prefix, one listing per partition.
+
+        The top level of the prefix is listed with a delimiter to discover its
+        partitions ("subdirectories"), which are then paginated concurrently.
+
+        Returns:
+            Unsorted list of parquet shard keys
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+
+        def parquet_keys(page: Dict[str, Any]) -> List[str]:
+            return [
+                obj["Key"]
+                for obj in page.get("Contents", [])
+                if obj["Key"].endswith(".parquet")
+            ]
+
+        def list_partition(prefix: str) -> List[str]:
+            keys = []
+            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=prefix):
+                keys.extend(parquet_keys(page))
+            return keys
+
+        shards = []
+        partitions = []
+        for page in paginator.paginate(
+            Bucket=self.s3_bucket, Prefix=self.s3_prefix, Delimiter="/"
+        ):
+            shards.extend(parquet_keys(page))
+            partitions.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+
+        if partitions:
+            with ThreadPoolExecutor(
+                max_workers=min(S3_LIST_THREADS, len(partitions)),
+                thread_name_prefix="shard-list",
+            ) as executor:
+                for keys in executor.map(list_partition, partitions):
+                    shards.extend(keys)
+
+        return shards
+
+    def _read_shard_cache(self) -> Optional[List[str]]:
+        """Read the cached shard list for this input directory, if any."""
+        if not self.shard_cache or not os.path.exists(self.shard_cache):
+            return None
+
+        try:
+            with open(self.shard_cache, "rb") as f:
+                cache = orjson.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable shard cache {self.shard_cache}: {e}")
+            return None
+
+        if cache.get("input_dir") != self.input_dir:
+            return None
+        return cache.get("shards")
+
+    def _write_shard_cache(self, shards: List[str]) -> None:
+        """Save the shard list so later runs can skip listing."""
+        if not self.shard_cache:
+            return
+
+        try:
+            with open(self.shard_cache, "wb") as f:
+                f.write(orjson.dumps({"input_dir": self.input_dir, "shards": shards}))
+        except OSError as e:
+            logger.warning(f"Failed to write shard cache {self.shard_cache}: {e}")
+
+    def load_shard(self, shard_path: str) -> pq.ParquetFile:
+        """Open a parquet shard for streaming.
+
+        Only the footer is parsed here; row groups are decoded lazily by
+        ``iter_batches`` so the shard is never materialized as a DataFrame.
 
         Args:
             shard_path: S3 key or local path to parquet file
 
         Returns:
-            DataFrame with shard data
+            ParquetFile for the shard
         """
         try:
             if self.is_s3:
                 # Load from S3
-                obj = self.s3_client.get_object(
-                    Bucket=self.s3_bucket, Key=shard_path
+                parquet_file = pq.ParquetFile(
+                    self.s3_fs.open_input_file(f"{self.s3_bucket}/{shard_path}"),
+                    pre_buffer=True,
+                )
+                logger.debug(
+                    f"Loaded S3 shard {shard_path}: "
+                    f"{parquet_file.metadata.num_rows} rows"
                 )
-                parquet_buffer = io.BytesIO(obj["Body"].read())
-                df = pd.read_parquet(parquet_buffer)
-                logger.debug(f"Loaded S3 shard {shard_path}: {len(df)} rows")
             else:
                 # Load from local filesystem
-                df = pd.read_parquet(shard_path)
-                logger.debug(f"Loaded local shard {shard_path}: {len(df)} rows")
+                parquet_file = pq.ParquetFile(
+                    shard_path, memory_map=True, pre_buffer=True
+                )
+                logger.debug(
+                    f"Loaded local shard {shard_path}: "
+                    f"{parquet_file.metadata.num_rows} rows"
+                )
 
-            return df
+            return parquet_file
 
         except Exception as e:
             logger.error(f"Failed to load shard {shard_path}: {e}")
             raise
 
-    def load_image_from_url(self, image_url: str) -> Image.Image:
-        """Load image from URL (S3 or local path).
+    def _shard_columns(self, parquet_file: pq.ParquetFile) -> List[str]:
+        """Return the columns of a shard to read (sample and metadata)."""
+        return [
+            name
+            for name in parquet_file.schema_arrow.names
+            if name in SAMPLE_COLUMNS
+            or self.metadata_columns is None
+            or name in self.metadata_columns
+        ]
+
+    def _read_shard_head(
+        self, shard_path: str
+    ) -> Tuple[pq.ParquetFile, List[str], pa.Table]:
+        """Open a shard and read its first row group.
+
+        Runs on the prefetch threads, so the next shards' data (all of it
+        for the usual single-row-group shard) is downloaded and decoded
+        while the current one is processed.
+
+        Args:
+            shard_path: S3 key or local path to parquet file
+
+        Returns:
+            Tuple of (ParquetFile, columns to read, first row group)
+        """
+        parquet_file = self.load_shard(shard_path)
+        names = self._shard_columns(parquet_file)
+        if parquet_file.num_row_groups:
+            head = parquet_file.read_row_group(0, columns=names, use_threads=True)
+        else:
+            head = parquet_file.schema_arrow.empty_table().select(names)
+        return parquet_file, names, head
+
+    def _prefetch_shards(
+        self, shard_paths: Iterable[str]
+    ) -> Iterator[Tuple[pq.ParquetFile, List[str], pa.Table]]:
+        """Load shards in order while keeping the next ones downloading.
+
+        Up to ``prefetch_depth`` shards ahead have their first row group read
+        in the background.
+
+        Args:
+            shard_paths: Shards to load
+
+        Yields:
+            Tuples of (ParquetFile, columns to read, first row group) for each
+            shard, in the order given
+        """
+        shard_iter = iter(shard_paths)
+        pending: Deque[Future] = deque(
+            self._shard_executor.submit(self._read_shard_head, shard_path)
+            for shard_path in islice(shard_iter, self.prefetch_depth)
+        )
+
+        try:
+            while pending:
+                shard = pending.popleft().result()
+
+                next_shard = next(shard_iter, None)
+                if next_shard is not None:
+                    pending.append(
+                        self._shard_executor.submit(self._read_shard_head, next_shard)
+                    )
+
+                yield shard
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Shut down background download threads."""
+        self._shard_executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_image_bytes(self, image_url: str) -> bytes:
+        """Fetch encoded image bytes from URL (S3 or local path).
 
         Args:
             image_url: Image URL (s3://bucket/key or local path)
 
         Returns:
-            PIL Image
+            Raw (still encoded) image bytes
         """
         if image_url.startswith("s3://"):
-            # Parse S3 URL
-            parsed = urlparse(image_url)
-            bucket = parsed.netloc
-            key = parsed.path.lstrip("/")
+            return self._fetch_s3(image_url)
+        return self._fetch_local(image_url)
 
-            try:
-                obj = self.s3_client.get_object(Bucket=bucket, Key=key)
-                image_bytes = obj["Body"].read()
-                return decode_image(image_bytes)
-            except ClientError as e:
-                logger.error(f"Failed to load image from S3: {image_url}, {e}")
-                raise
+    def _fetch_s3(self, image_url: str) -> bytes:
+        """Fetch an object given as s3://bucket/key."""
+        # A plain split: urlparse costs more than this per-image hot path
+        # needs, and S3 keys carry no query or fragment
+        bucket, _, key = image_url[len("s3://") :].partition("/")
+
+        try:
+            obj = self.s3_client.get_object(Bucket=bucket, Key=key)
+            return obj["Body"].read()
+        except ClientError as e:
+            logger.error(f"Failed to load image from S3: {image_url}, {e}")
+            raise
+
+    def _fetch_local(self, image_url: str) -> bytes:
+        """Read a file from the local filesystem."""
+        try:
+            with open(image_url, "rb") as f:
+                return f.read()
+        except Exception as e:
+            logger.error(f"Failed to load local image: {image_url}, {e}")
+            raise
+
+    def load_image_array(self, image_url: str) -> np.ndarray:
+        """Load a pre-decoded image stored as a ``.npy`` array.
+
+        Local files are memory-mapped rather than read.
+
+        Args:
+            image_url: Array URL (s3://bucket/key.npy or local path)
+
+        Returns:
+            HWC uint8 RGB array
+
+        Raises:
+            InvalidImageError: If the array is not an HWC uint8 RGB image
+        """
+        if image_url.startswith("s3://"):
+            array = np.load(io.BytesIO(self.fetch_image_bytes(image_url)))
         else:
-            # Local filesystem
-            try:
-                with open(image_url, "rb") as f:
-                    image_bytes = f.read()
-                return decode_image(image_bytes)
-            except Exception as e:
-                logger.error(f"Failed to load local image: {image_url}, {e}")
-                raise
+            array = np.load(image_url, mmap_mode="r")
+
+        if array.dtype != np.uint8 or array.ndim != 3 or array.shape[-1] != 3:
+            raise InvalidImageError(
+                f"Expected HWC uint8 RGB array, got {array.dtype} {array.shape}"
+            )
+        return array
+
+    def load_image_from_url(self, image_url: str) -> Image.Image:
+        """Load and decode image from URL (S3 or local path).
+
+        Args:
+            image_url: Image URL (s3://bucket/key or local path)
+
+        Returns:
+            PIL Image
+        """
+        return decode_image(self.fetch_image_bytes(image_url))
+
+    def iterate_record_batches(
+        self, shard_paths: Optional[List[str]] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Iterate over shards as Arrow record batches.
+
+        Every batch starts with the ``url``, ``caption`` and ``key`` columns
+        (empty strings when a shard lacks one), followed by the metadata
+        columns. Requested metadata columns a shard lacks are all-null.
+
+        Args:
+            shard_paths: Specific shards to process (None = all)
+
+        Yields:
+            Record batches of up to PARQUET_READ_BATCH_SIZE rows
+        """
+        if shard_paths is None:
+            shard_paths = self.list_shards()
+
+        for parquet_file, names, head in self._prefetch_shards(shard_paths):
+            meta_names = [name for name in names if name not in SAMPLE_COLUMNS]
+            # Requested metadata the shard lacks is null, so every batch
+            # carries the same columns
+            absent = (
+                sorted(self.metadata_columns - set(names))
+                if self.metadata_columns is not None
+                else []
+            )
+
+            # The first row group was read on the prefetch thread; the rest
+            # stream in as the shard is consumed
+            record_batches = chain(
+                head.to_batches(max_chunksize=PARQUET_READ_BATCH_SIZE),
+                parquet_file.iter_batches(
+                    batch_size=PARQUET_READ_BATCH_SIZE,
+                    row_groups=range(1, parquet_file.num_row_groups),
+                    columns=names,
+                    use_threads=True,
+                ),
+            )
+            for record_batch in record_batches:
+                num_rows = record_batch.num_rows
+                yield pa.RecordBatch.from_arrays(
+                    [
+                        record_batch.column(name)
+                        if name in names
+                        else pa.repeat("", num_rows)
+                        for name in SAMPLE_COLUMNS
+                    ]
+                    + [record_batch.column(name) for name in meta_names]
+                    + [pa.nulls(num_rows) for _ in absent],
+                    names=[*SAMPLE_COLUMNS, *meta_names, *absent],
+                )
+
+    def iterate_batches(
+        self,
+        batch_size: int,
+        max_samples: Optional[int] = None,
+        shard_paths: Optional[List[str]] = None,
+    ) -> Iterator[pa.Table]:
+        """Group rows into columnar batches of ``batch_size`` samples.
+
+        Batches may span shards; metadata columns missing from a shard are
+        null. Each batch is compacted into its own buffers, so it neither
+        keeps its shard's record batch alive nor serializes all of it.
+
+        Args:
+            batch_size: Number of samples per batch
+            max_samples: Max samples to yield (None = all)
+            shard_paths: Specific shards to process (None = all)
+
+        Yields:
+            Tables of up to batch_size rows, columns as in
+            ``iterate_record_batches``
+        """
+
+        def combine(parts: List[pa.RecordBatch]) -> pa.Table:
+            table = pa.concat_tables(
+                [pa.Table.from_batches([part]) for part in parts],
+                promote_options="permissive",
+            )
+            return table.take(np.arange(table.num_rows))
+
+        parts: List[pa.RecordBatch] = []
+        buffered = 0
+        num_samples = 0
+
+        for record_batch in self.iterate_record_batches(shard_paths):
+            if max_samples:
+                record_batch = record_batch.slice(0, max_samples - num_samples)
+            num_samples += record_batch.num_rows
+
+            offset = 0
+            while offset < record_batch.num_rows:
+                length = min(batch_size - buffered, record_batch.num_rows - offset)
+                parts.append(record_batch.slice(offset, length))
+                buffered += length
+                offset += length
+
+                if buffered == batch_size:
+                    yield combine(parts)
+                    parts = []
+                    buffered = 0
+
+            if max_samples and num_samples >= max_samples:
+                break
+
+        if parts:
+            yield combine(parts)
 
     def iterate_samples(
         self, shard_paths: Optional[List[str]] = None
@@ -186,28 +606,39 @@ class UnifiedDataLoader:
             shard_paths: Specific shards to process (None = all)
 
         Yields:
-            Sample dict with: url, image (optional), caption, metadata
+            Sample dict with: url, caption, key, metadata
         """
-        if shard_paths is None:
-            shard_paths = self.list_shards()
+        for record_batch in self.iterate_record_batches(shard_paths):
+            yield from self._samples_from_batch(record_batch)
 
-        for shard_path in shard_paths:
-            df = self.load_shard(shard_path)
+    @staticmethod
+    def _samples_from_batch(record_batch: pa.RecordBatch) -> Iterator[Dict[str, Any]]:
+        """Convert an Arrow record batch into sample dicts.
 
-            for idx, row in df.iterrows():
-                sample = {
-                    "url": row.get("url", ""),
-                    "caption": row.get("caption", ""),
-                    "key": row.get("key", ""),
-                    "metadata": {},
-                }
+        Args:
+            record_batch: Batch as yielded by ``iterate_record_batches``
+
+        Yields:
+            Sample dict with: url, caption, key, metadata
+        """
+        num_rows = record_batch.num_rows
+
+        # Convert whole columns at once instead of boxing each cell
+        urls, captions, keys = (
+            record_batch.column(name).to_pylist() for name in SAMPLE_COLUMNS
+        )
 
-                # Add any additional columns as metadata
-                for col in df.columns:
-                    if col not in ["url", "caption", "key"]:
-                        sample["metadata"][col] = row[col]
+        # Build all metadata dicts in one pass through Arrow's struct conversion
+        meta_names = record_batch.schema.names[len(SAMPLE_COLUMNS) :]
+        if meta_names:
+            metadata = pa.StructArray.from_arrays(
+                [record_batch.column(name) for name in meta_names], meta_names
+            ).to_pylist()
+        else:
+            metadata = [{} for _ in range(num_rows)]
 
-                yield sample
+        for url, caption, key, meta in zip(urls, captions, keys, metadata):
+            yield {"url": url, "caption": caption, "key": key, "metadata": meta}
 
 
 class UnifiedOutputWriter:
@@ -237,16 +668,17 @@ class UnifiedOutputWriter:
             self.s3_bucket = parsed.netloc
             self.s3_prefix = parsed.path.lstrip("/")
 
-            # Initialize S3 client
-            session_kwargs = {}
-            if aws_access_key and aws_secret_key:
-                session_kwargs = {
-                    "aws_access_key_id": aws_access_key,
-                    "aws_secret_access_key": aws_secret_key,
-                }
-
-            self.s3_client = boto3.client(
-                "s3", region_name=aws_region or "us-east-1", **session_kwargs
+            # Outputs are streamed as multipart uploads: memory is bounded by
+            # the part size and parts upload in the background while the
+            # next ones are written
+            self.s3_fs = pafs.S3FileSystem(
+                region=aws_region or "us-east-1",
+                access_key=aws_access_key if aws_secret_key else None,
+                secret_key=aws_secret_key if aws_access_key else None,
+                endpoint_override=(
+                    os.environ.get("AWS_ENDPOINT_URL_S3")
+                    or os.environ.get("AWS_ENDPOINT_URL")
+                ),
             )
 
             logger.info(f"Output to S3: s3://{self.s3_bucket}/{self.s3_prefix}")
@@ -256,29 +688,63 @@ class UnifiedOutputWriter:
             self.local_path.mkdir(parents=True, exist_ok=True)
             logger.info(f"Output to local: {self.local_path}")
 
-    def write_parquet(self, df: pd.DataFrame, filename: str) -> None:
-        """Write DataFrame to parquet.
+    def uri(self, filename: str) -> str:
+        """Return the full destination of an output file.
 
         Args:
-            df: DataFrame to write
-            filename: Output filename (e.g., 'embeddings.parquet')
+            filename: Output filename
+
+        Returns:
+            s3:// URI or local path
         """
         if self.is_s3:
-            # Write to S3
-            buffer = io.BytesIO()
-            df.to_parquet(buffer, index=False)
-            buffer.seek(0)
-
             s3_key = f"{self.s3_prefix}/{filename}".lstrip("/")
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket, Key=s3_key, Body=buffer.getvalue()
-            )
-            logger.info(f"Wrote parquet to s3://{self.s3_bucket}/{s3_key}")
-        else:
-            # Write to local filesystem
-            output_file = self.local_path / filename
-            df.to_parquet(output_file, index=False)
-            logger.info(f"Wrote parquet to {output_file}")
+            return f"s3://{self.s3_bucket}/{s3_key}"
+        return str(self.local_path / filename)
+
+    def open_output_stream(self, filename: str) -> pa.NativeFile:
+        """Open an output file for writing.
+
+        For S3 the object becomes visible once the stream is closed.
+
+        Args:
+            filename: Output filename
+
+        Returns:
+            Writable Arrow stream
+        """
+        if self.is_s3:
+            return self.s3_fs.open_output_stream(self.uri(filename)[len("s3://") :])
+        return pa.OSFile(self.uri(filename), "wb")
+
+    def write_parquet(
+        self, table: Union[pa.Table, pd.DataFrame], filename: str
+    ) -> None:
+        """Write a table to parquet.
+
+        Args:
+            table: Arrow table (or DataFrame) to write
+            filename: Output filename (e.g., 'embeddings.parquet')
+        """
+        if isinstance(table, pd.DataFrame):
+            table = pa.Table.from_pandas(table, preserve_index=False)
+
+        with self.open_output_stream(filename) as sink:
+            pq.write_table(table, sink, compression=PARQUET_COMPRESSION)
+        logger.info(f"Wrote parquet to {self.uri(filename)}")
+
+    def open_parquet(self, filename: str, schema: pa.Schema) -> "ParquetStreamWriter":
+        """Open a parquet file for incremental writes.
+
+        Args:
+            filename: Output filename (e.g., 'embeddings.parquet')
+            schema: Result columns of the file (see ``ParquetStreamWriter``)
+
+        Returns:
+            Stream writer; close it (or use it as a context manager) to
+            finalize the file
+        """
+        return ParquetStreamWriter(self, filename, schema)
 
     def write_json(self, data: dict, filename: str) -> None:
         """Write dict to JSON.
@@ -287,36 +753,193 @@ class UnifiedOutputWriter:
             data: Dictionary to write
             filename: Output filename (e.g., 'metadata.json')
         """
-        json_str = json.dumps(data, indent=2)
+        json_bytes = orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        )
 
-        if self.is_s3:
-            # Write to S3
-            s3_key = f"{self.s3_prefix}/{filename}".lstrip("/")
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket, Key=s3_key, Body=json_str.encode()
+        with self.open_output_stream(filename) as sink:
+            sink.write(json_bytes)
+        logger.info(f"Wrote JSON to {self.uri(filename)}")
+
+
+class ParquetStreamWriter:
+    """Append tables to a single parquet file as results arrive.
+
+    The output schema is the given result columns followed by any metadata
+    columns (names starting with ``metadata_prefix``). Metadata types are
+    unified across tables, so tables are buffered while a metadata column
+    has only been seen as all-null, up to OUTPUT_SCHEMA_BUFFER_ROWS rows.
+    Once the file is open its schema is fixed: columns missing from a table
+    are filled with nulls, and anything that does not fit raises instead of
+    being dropped. Row groups are streamed straight to the destination (as a
+    multipart upload for S3).
+    """
+
+    def __init__(
+        self,
+        output_writer: "UnifiedOutputWriter",
+        filename: str,
+        schema: pa.Schema,
+        metadata_prefix: str = "meta_",
+    ):
+        """Initialize stream writer.
+
+        Args:
+            output_writer: Output writer that owns the destination
+            filename: Output filename (e.g., 'embeddings.parquet')
+            schema: Result columns every table is cast to
+            metadata_prefix: Prefix of the metadata columns carried through
+                with their own types
+        """
+        self.output_writer = output_writer
+        self.filename = filename
+        self.metadata_prefix = metadata_prefix
+        self.num_rows = 0
+        self._result_schema = schema
+        self._sink: Optional[pa.NativeFile] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+
+        # Tables held back until the metadata column types are known
+        self._pending: List[pa.Table] = []
+        self._pending_rows = 0
+        self._metadata_schema = pa.schema([])
+
+    def write_table(self, table: pa.Table) -> None:
+        """Append a table as one or more row groups.
+
+        Args:
+            table: Arrow table with the result columns and optional metadata
+                columns
+
+        Raises:
+            ValueError: If the table has a column outside the output schema or
+                a value that the open file cannot store
+        """
+        unexpected = [
+            name
+            for name in table.column_names
+            if name not in self._result_schema.names
+            and not name.startswith(self.metadata_prefix)
+        ]
+        if unexpected:
+            raise ValueError(f"Columns not in output schema: {unexpected}")
+
+        if self._writer is not None:
+            self._write(self._align(table))
+            return
+
+        metadata_fields = [
+            field for field in table.schema if field.name.startswith(self.metadata_prefix)
+        ]
+        self._metadata_schema = pa.unify_schemas(
+            [self._metadata_schema, pa.schema(metadata_fields)],
+            promote_options="permissive",
+        )
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+
+        types_known = not any(pa.types.is_null(f.type) for f in self._metadata_schema)
+        if types_known or self._pending_rows >= OUTPUT_SCHEMA_BUFFER_ROWS:
+            self._open()
+
+    def _open(self) -> None:
+        """Open the output file and write the buffered tables."""
+        self._schema = pa.unify_schemas([self._result_schema, self._metadata_schema])
+        self._sink = self.output_writer.open_output_stream(self.filename)
+        self._writer = pq.ParquetWriter(
+            self._sink,
+            self._schema,
+            compression=PARQUET_COMPRESSION,
+            use_dictionary=["url", "key", "caption"],
+        )
+
+        pending, self._pending, self._pending_rows = self._pending, [], 0
+        for table in pending:
+            self._write(self._align(table))
+
+    def _write(self, table: pa.Table) -> None:
+        """Append an aligned table to the open file."""
+        self._writer.write_table(table)
+        self.num_rows += table.num_rows
+
+    def _align(self, table: pa.Table) -> pa.Table:
+        """Conform a table to the schema of the open file.
+
+        Raises:
+            ValueError: If the table has a column the file lacks, or non-null
+                values in a column the file stores as null
+        """
+        if table.schema.equals(self._schema):
+            return table
+
+        extra = set(table.column_names) - set(self._schema.names)
+        if extra:
+            raise ValueError(
+                f"Columns {sorted(extra)} first appeared after {self.filename} "
+                f"was opened; select a fixed set with --metadata_columns"
             )
-            logger.info(f"Wrote JSON to s3://{self.s3_bucket}/{s3_key}")
-        else:
-            # Write to local filesystem
-            output_file = self.local_path / filename
-            with open(output_file, "w") as f:
-                f.write(json_str)
-            logger.info(f"Wrote JSON to {output_file}")
 
+        columns = []
+        for field in self._schema:
+            if field.name not in table.column_names:
+                columns.append(pa.nulls(table.num_rows, type=field.type))
+                continue
+
+            column = table.column(field.name)
+            if pa.types.is_null(field.type) and column.null_count < len(column):
+                raise ValueError(
+                    f"Column {field.name} was written as all-null to {self.filename} "
+                    f"but now has {column.type} values"
+                )
+            columns.append(column.cast(field.type))
+        return pa.Table.from_arrays(columns, schema=self._schema)
+
+    def close(self) -> None:
+        """Write any buffered tables and the parquet footer, finalizing the file."""
+        if self._pending:
+            self._open()
+        if self._writer is None:
+            return
+
+        try:
+            self._writer.close()
+        finally:
+            self._sink.close()
+            self._writer = None
+            self._sink = None
+        logger.info(f"Wrote parquet to {self.output_writer.uri(self.filename)}")
+
+    def __enter__(self) -> "ParquetStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
-@ray.remote(num_gpus=1 if torch.cuda.is_available() else 0)
+
+@ray.remote(
+    num_gpus=1 if torch.cuda.is_available() else 0, max_concurrency=TASKS_PER_WORKER
+)
 class BatchInferenceWorker:
-    """Ray actor for batch inference."""
+    """Ray actor for batch inference.
+
+    The actor is threaded: image decoding for one batch overlaps inference on
+    another, while model calls themselves are serialized.
+    """
 
-    def __init__(self, model_directory: str, config):
+    def __init__(
+        self, model_directory: str, config, embedding_dtype: str = "float32"
+    ):
         """Initialize worker.
 
         Args:
             model_directory: Path to model directory
             config: Service configuration
+            embedding_dtype: Storage type embeddings are returned in
         """
         self.config = config
         self.model_directory = model_directory
+        self.embedding_dtype = embedding_dtype
 
         logger.info(f"Initializing BatchInferenceWorker for {model_directory}")
 
@@ -325,8 +948,7 @@ class BatchInferenceWorker:
         self.model_info, self.model = load_model(model_directory)
         load_duration = time.time() - start_time
 
-        # Validate interface
-        validate_model_interface(self.model)
+        # The interface was validated once on the driver
 
         # Initialize metrics
         self.metrics = MetricsCollector(self.model_info.name)
@@ -338,6 +960,14 @@ class BatchInferenceWorker:
         self.model.load()
         logger.info("Model weights loaded")
 
+        # Apply the configured precision
+        if config.models.dtype != "auto":
+            if hasattr(self.model, "to_dtype"):
+                self.model.to_dtype(config.models.dtype)
+                logger.info(f"Model precision set to {config.models.dtype}")
+            else:
+                logger.warning("Model has no to_dtype(); ignoring models.dtype")
+
         # Warmup
         if config.models.warmup_enabled:
             start_time = time.time()
@@ -346,49 +976,288 @@ class BatchInferenceWorker:
             self.metrics.record_model_warmup(warmup_duration)
             logger.info(f"Model warmed up in {warmup_duration:.2f}s")
 
+        # Models may capture their forward pass as CUDA graphs
+        if (
+            config.models.cuda_graph_enabled
+            and torch.cuda.is_available()
+            and hasattr(self.model, "capture_cuda_graphs")
+        ):
+            start_time = time.time()
+            self.model.capture_cuda_graphs()
+            logger.info(f"CUDA graphs captured in {time.time() - start_time:.2f}s")
+
         # Get batch configuration
         self.batch_size = self.model.batch_size()
-        logger.info(f"Worker ready: batch_size={self.batch_size}")
 
-    def process_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Models may declare the smallest image side they need, letting JPEGs
+        # be decoded at a reduced DCT scale
+        self.input_size = getattr(self.model, "input_size", None)
+
+        # Decode JPEGs with nvJPEG when the model can consume device tensors
+        self.gpu_decode = torch.cuda.is_available() and getattr(
+            self.model, "accepts_tensor_images", False
+        )
+        self._decode_stream = torch.cuda.Stream() if self.gpu_decode else None
+
+        # Pinned staging buffer for images decoded on the CPU, grown on demand;
+        # the event marks when the last upload from it has finished
+        self._pinned: Optional[torch.Tensor] = None
+        self._upload_done = torch.cuda.Event() if self.gpu_decode else None
+        self._upload_lock = threading.Lock()
+
+        # Only one batch runs through the model at a time
+        self._encode_lock = threading.Lock()
+
+        # Models taking preprocessed pixels get reusable uint8 (B, S, S, 3)
+        # buffers: one pinned host buffer per concurrent task, filled while
+        # the model runs, and a single device buffer fed by async copies
+        self._pixel_buffers: Optional["queue.Queue[torch.Tensor]"] = None
+        self._device_pixels: Optional[torch.Tensor] = None
+        if (
+            not self.gpu_decode
+            and self.input_size
+            and hasattr(self.model, "encode_tensor")
+        ):
+            pinned = torch.cuda.is_available()
+            shape = (self.batch_size, self.input_size, self.input_size, 3)
+            self._pixel_buffers = queue.Queue()
+            for _ in range(TASKS_PER_WORKER):
+                self._pixel_buffers.put(
+                    torch.empty(shape, dtype=torch.uint8, pin_memory=pinned)
+                )
+            if pinned:
+                self._device_pixels = torch.empty(shape, dtype=torch.uint8, device="cuda")
+
+        logger.info(
+            f"Worker ready: batch_size={self.batch_size}, gpu_decode={self.gpu_decode}"
+        )
+
+    def get_batch_size(self) -> int:
+        """Get the model's preferred batch size.
+
+        Returns:
+            Batch size
+        """
+        return self.batch_size
+
+    def _decode_images(
+        self, raw_images: List[Optional[Union[memoryview, np.ndarray]]]
+    ) -> List[Optional[Any]]:
+        """Decode a batch of encoded images.
+
+        With GPU decode enabled, JPEGs are decoded in one batched nvJPEG call
+        and every image is returned as a CHW uint8 tensor; otherwise images
+        are decoded on the CPU into PIL Images. Pre-decoded arrays are only
+        wrapped, never decoded.
+
+        Args:
+            raw_images: Encoded image buffers, HWC uint8 arrays for
+                pre-decoded images, or None for missing images
+
+        Returns:
+            Decoded images, with None for images that could not be decoded
+        """
+        images: List[Optional[Any]] = [None] * len(raw_images)
+        pending = list(range(len(raw_images)))
+
+        if self.gpu_decode:
+            jpeg_indices = [
+                i
+                for i in pending
+                if isinstance(raw_images[i], memoryview)
+                and raw_images[i][:3] == JPEG_MAGIC
+            ]
+            if jpeg_indices:
+                try:
+                    with torch.cuda.stream(self._decode_stream):
+                        decoded = decode_jpeg(
+                            [
+                                torch.frombuffer(bytearray(raw_images[i]), dtype=torch.uint8)
+                                for i in jpeg_indices
+                            ],
+                            mode=ImageReadMode.RGB,
+                            device="cuda",
+                        )
+                    torch.cuda.current_stream().wait_stream(self._decode_stream)
+                    for i, image in zip(jpeg_indices, decoded):
+                        images[i] = image
+                    pending = [i for i in pending if images[i] is None]
+                except RuntimeError as e:
+                    logger.warning(f"GPU decode failed, falling back to CPU: {e}")
+
+        for i in pending:
+            if raw_images[i] is None:
+                continue
+
+            if isinstance(raw_images[i], np.ndarray):
+                if self.gpu_decode:
+                    images[i] = torch.from_numpy(
+                        np.ascontiguousarray(raw_images[i].transpose(2, 0, 1))
+                    )
+                else:
+                    images[i] = Image.fromarray(raw_images[i])
+                continue
+
+            try:
+                image = decode_image(raw_images[i], min_size=self.input_size)
+            except InvalidImageError as e:
+                logger.warning(f"Failed to decode image: {e}")
+                self.metrics.record_error("decode_error")
+                continue
+
+            if self.gpu_decode:
+                # Keep the batch homogeneous for models consuming tensors
+                image = pil_to_tensor(image)
+            images[i] = image
+
+        if self.gpu_decode:
+            cpu_indices = [i for i in pending if images[i] is not None]
+            if cpu_indices:
+                uploaded = self._upload_images([images[i] for i in cpu_indices])
+                for i, image in zip(cpu_indices, uploaded):
+                    images[i] = image
+
+        return images
+
+    def _upload_images(self, images: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Copy CPU image tensors to the GPU in one pinned-memory transfer.
+
+        Images are packed into a reusable pinned buffer and sent with a single
+        asynchronous copy, rather than one pageable copy per image.
+
+        Args:
+            images: CHW uint8 tensors on the CPU
+
+        Returns:
+            The same images as tensors on the GPU
+        """
+        with self._upload_lock:
+            return self._upload_images_locked(images)
+
+    def _upload_images_locked(self, images: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Body of ``_upload_images``; the caller holds ``_upload_lock``."""
+        sizes = [image.numel() for image in images]
+        total = sum(sizes)
+
+        # The previous upload must finish before the buffer is overwritten
+        self._upload_done.synchronize()
+        if self._pinned is None or self._pinned.numel() < total:
+            self._pinned = torch.empty(total, dtype=torch.uint8, pin_memory=True)
+
+        offset = 0
+        for image, size in zip(images, sizes):
+            self._pinned[offset : offset + size].view(image.shape).copy_(image)
+            offset += size
+
+        with torch.cuda.stream(self._decode_stream):
+            packed = self._pinned[:total].to("cuda", non_blocking=True)
+            self._upload_done.record()
+        torch.cuda.current_stream().wait_stream(self._decode_stream)
+        # Allocated on the side stream but consumed on the current one
+        packed.record_stream(torch.cuda.current_stream())
+
+        return [
+            chunk.view(image.shape)
+            for chunk, image in zip(packed.split(sizes), images)
+        ]
+
+    def _encode_pixels(self, images: List[Image.Image]) -> Any:
+        """Encode images through the model's ``encode_tensor`` path.
+
+        Images are resized and center-cropped straight into a reusable host
+        buffer, which is copied into the device buffer asynchronously right
+        before inference.
+
+        Args:
+            images: Decoded PIL Images
+
+        Returns:
+            Embeddings as returned by the model
+        """
+        size = self.input_size
+        count = len(images)
+        host = self._pixel_buffers.get()
+        try:
+            # Batches larger than the model's preferred size grow the buffer
+            if host.shape[0] < count:
+                host = torch.empty(
+                    (count, size, size, 3),
+                    dtype=torch.uint8,
+                    pin_memory=self._device_pixels is not None,
+                )
+            pixels = host[:count]
+            crop_images(images, size, out=pixels.numpy())
+
+            with self._encode_lock, torch.inference_mode():
+                if self._device_pixels is not None:
+                    if self._device_pixels.shape[0] < count:
+                        self._device_pixels = torch.empty_like(host, device="cuda")
+                    device_pixels = self._device_pixels[:count]
+                    device_pixels.copy_(pixels, non_blocking=True)
+                    pixels = device_pixels
+                # The model copies embeddings back to the host, so both
+                # buffers are free again once this returns
+                return self.model.encode_tensor(pixels)
+        finally:
+            self._pixel_buffers.put(host)
+
+    def process_batch(
+        self, batch: pa.Table, images: List[Optional[np.ndarray]]
+    ) -> Dict[str, Any]:
         """Process a batch of samples.
 
         Args:
-            batch: List of samples with images
+            batch: Columnar samples (url, caption, key and metadata columns)
+            images: One image per row: encoded bytes as a 1-D uint8 array, an
+                HWC uint8 array for pre-decoded images, or None if missing
 
         Returns:
-            List of results with embeddings
+            ``rows``: the samples that were encoded, as a table, plus their
+            ``embedding`` array of shape (N, D) (and ``embedding_scale`` for
+            int8)
         """
         start_time = time.time()
 
         try:
-            # Prepare batch
-            payloads = [
-                {"image": sample["image"], "text": sample.get("caption")}
-                for sample in batch
-            ]
+            # Decode images, dropping samples that fail
+            images = self._decode_images(
+                [
+                    memoryview(image) if image is not None and image.ndim == 1 else image
+                    for image in images
+                ]
+            )
+            keep = [i for i, image in enumerate(images) if image is not None]
+            rows = batch
+            if len(keep) < batch.num_rows:
+                rows = batch.take(pa.array(keep, type=pa.int64()))
+            images = [images[i] for i in keep]
+            if not keep:
+                return self._result(rows, np.empty((0, 0), dtype=np.float32))
+
+            if self._pixel_buffers is not None:
+                embeddings = self._encode_pixels(images)
+            else:
+                # Prepare batch
+                payloads = [
+                    {"image": image, "text": caption}
+                    for image, caption in zip(images, rows.column("caption").to_pylist())
+                ]
 
-            # Run inference
-            embeddings = self.model.encode(payloads)
-
-            # Prepare results
-            results = []
-            for sample, embedding in zip(batch, embeddings):
-                result = {
-                    "url": sample["url"],
-                    "key": sample.get("key", ""),
-                    "caption": sample.get("caption", ""),
-                    "embedding": embedding,
-                    "metadata": sample.get("metadata", {}),
-                }
-                results.append(result)
+                # Run inference without autograd bookkeeping
+                with self._encode_lock, torch.inference_mode():
+                    embeddings = self.model.encode(payloads)
+
+            results = self._result(rows, embeddings)
 
             duration = time.time() - start_time
-            self.metrics.record_batch(len(batch), duration)
+            self.metrics.record_batch(rows.num_rows, duration)
 
-            logger.debug(
-                f"Processed batch: size={len(batch)}, duration={duration*1000:.2f}ms"
-            )
+            # Skip formatting the per-batch message unless it will be emitted
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Processed batch: size={rows.num_rows}, "
+                    f"duration={duration*1000:.2f}ms"
+                )
 
             return results
 
@@ -397,6 +1266,200 @@ class BatchInferenceWorker:
             self.metrics.record_error("processing_error")
             raise
 
+    def _result(self, rows: pa.Table, embeddings: Any) -> Dict[str, Any]:
+        """Pair the encoded rows with their embeddings.
+
+        Embeddings are packed into one contiguous array in the output storage
+        type when they all have the same length.
+
+        Args:
+            rows: Samples that were encoded
+            embeddings: One embedding per row
+
+        Returns:
+            Dict with ``rows`` and the embedding columns
+        """
+        try:
+            columns = quantize_embeddings(
+                np.asarray(embeddings, dtype=np.float32), self.embedding_dtype
+            )
+        except ValueError:
+            if self.embedding_dtype != "float32":
+                raise ValueError(
+                    f"{self.embedding_dtype} embeddings require a fixed embedding "
+                    f"dimension"
+                )
+            # Variable-length embeddings stay a list of vectors
+            columns = {"embedding": [np.asarray(e, dtype=np.float32) for e in embeddings]}
+
+        return {"rows": rows, **columns}
+
+
+def prefetch_iterator(
+    items: Iterable[Any], depth: int, name: str = "prefetch"
+) -> Iterator[Any]:
+    """Produce items on a background thread, up to ``depth`` ahead.
+
+    Exceptions raised by the producer are re-raised in the consumer. Closing
+    the returned generator stops the producer.
+
+    Args:
+        items: Iterable to consume in the background
+        depth: Maximum number of produced items waiting to be consumed
+        name: Name of the producer thread
+
+    Yields:
+        Items in their original order
+    """
+    done = object()
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        # Time out periodically so a stopped consumer releases the producer
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(done)
+        except BaseException as e:
+            put(e)
+        finally:
+            # Release the source's resources from the thread iterating it
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def quantize_embeddings(
+    embeddings: np.ndarray, embedding_dtype: str = "float32"
+) -> Dict[str, np.ndarray]:
+    """Convert an (N, D) embedding array to the requested storage type.
+
+    Args:
+        embeddings: (N, D) float array
+        embedding_dtype: Storage type (see EMBEDDING_DTYPES)
+
+    Returns:
+        ``embedding`` as an (N, D) array of the storage type, plus an (N,)
+        float32 ``embedding_scale`` for int8
+
+    Raises:
+        ValueError: If the dtype is unknown
+    """
+    if embedding_dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {embedding_dtype}")
+
+    if embedding_dtype != "int8":
+        return {
+            "embedding": embeddings.astype(EMBEDDING_DTYPES[embedding_dtype], copy=False)
+        }
+
+    values = embeddings.astype(np.float32, copy=False)
+    if values.size:
+        scale = np.abs(values).max(axis=1, keepdims=True) / 127.0
+        scale[scale == 0] = 1.0
+    else:
+        scale = np.ones((len(values), 1), dtype=np.float32)
+    return {
+        "embedding": np.round(values / scale).astype(np.int8),
+        "embedding_scale": scale.reshape(-1).astype(np.float32, copy=False),
+    }
+
+
+def embedding_columns(
+    results: List[Dict[str, Any]], embedding_dtype: str = "float32"
+) -> Dict[str, pa.Array]:
+    """Concatenate the embedding columns of batch results into Arrow arrays.
+
+    Args:
+        results: Batch results as returned by
+            ``BatchInferenceWorker.process_batch``
+        embedding_dtype: Storage type the workers produced
+
+    Returns:
+        Mapping of column name to array: ``embedding``, plus
+        ``embedding_scale`` for int8
+    """
+    value_type = pa.from_numpy_dtype(EMBEDDING_DTYPES[embedding_dtype])
+    results = [r for r in results if r["rows"].num_rows]
+    embeddings = [r["embedding"] for r in results]
+
+    if (
+        embeddings
+        and all(isinstance(e, np.ndarray) and e.ndim == 2 for e in embeddings)
+        and len({e.shape[1] for e in embeddings}) == 1
+    ):
+        values = np.ascontiguousarray(np.concatenate(embeddings))
+        columns = {
+            "embedding": pa.FixedSizeListArray.from_arrays(
+                values.reshape(-1), values.shape[1]
+            )
+        }
+    else:
+        # Empty or variable-length: fall back to a plain list column
+        columns = {
+            "embedding": pa.array(
+                [row for e in embeddings for row in e], type=pa.list_(value_type)
+            )
+        }
+
+    if embedding_dtype == "int8":
+        scales = [r["embedding_scale"] for r in results]
+        columns["embedding_scale"] = pa.array(
+            np.concatenate(scales) if scales else np.empty(0, dtype=np.float32)
+        )
+
+    return columns
+
+
+def output_schema(
+    embedding_dtype: str = "float32", embedding_dim: Optional[int] = None
+) -> pa.Schema:
+    """Return the result columns of the embeddings output.
+
+    Args:
+        embedding_dtype: Storage type the workers produce
+        embedding_dim: Embedding length, or None for variable-length
+            embeddings
+
+    Returns:
+        Schema of url, key, caption, embedding and, for int8,
+        embedding_scale (metadata columns are added by the writer)
+    """
+    value_type = pa.from_numpy_dtype(EMBEDDING_DTYPES[embedding_dtype])
+    fields = [pa.field(name, pa.string()) for name in ("url", "key", "caption")]
+    if embedding_dim is None:
+        fields.append(pa.field("embedding", pa.list_(value_type)))
+    else:
+        fields.append(pa.field("embedding", pa.list_(value_type, embedding_dim)))
+    if embedding_dtype == "int8":
+        fields.append(pa.field("embedding_scale", pa.float32()))
+    return pa.schema(fields)
+
 
 class BatchInferenceOrchestrator:
     """Orchestrate batch inference across multiple workers."""
@@ -407,6 +1470,8 @@ class BatchInferenceOrchestrator:
         config,
         num_workers: int = 4,
         batch_size: Optional[int] = None,
+        fetch_threads: int = IMAGE_FETCH_THREADS,
+        embedding_dtype: str = "float32",
     ):
         """Initialize orchestrator.
 
@@ -415,17 +1480,33 @@ class BatchInferenceOrchestrator:
             config: Service configuration
             num_workers: Number of Ray workers
             batch_size: Batch size per worker (None = use model default)
+            fetch_threads: Number of threads fetching image bytes
+            embedding_dtype: Storage type for output embeddings
+                ('float32', 'float16' or 'int8')
         """
+        if embedding_dtype not in EMBEDDING_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding dtype: {embedding_dtype} "
+                f"(expected one of {sorted(EMBEDDING_DTYPES)})"
+            )
+
         self.model_directory = model_directory
         self.config = config
         self.num_workers = num_workers
         self.batch_size = batch_size
+        self.fetch_threads = max(1, fetch_threads)
+        self.embedding_dtype = embedding_dtype
 
         logger.info(f"Initializing orchestrator with {num_workers} workers")
 
+        # Fail fast on a broken model directory, once, before any actor is
+        # scheduled; only the module is imported here, no weights are loaded
+        _, model = load_model(model_directory)
+        validate_model_interface(model)
+
         # Create workers
         self.workers = [
-            BatchInferenceWorker.remote(model_directory, config)
+            BatchInferenceWorker.remote(model_directory, config, embedding_dtype)
             for _ in range(num_workers)
         ]
 
@@ -448,105 +1529,257 @@ class BatchInferenceOrchestrator:
         """
         logger.info(f"Starting batch processing")
 
-        # Collect samples
-        samples = []
-        sample_iter = data_loader.iterate_samples()
-
-        for sample in tqdm(sample_iter, desc="Loading samples"):
-            if load_images and "url" in sample:
-                try:
-                    sample["image"] = data_loader.load_image_from_url(sample["url"])
-                except Exception as e:
-                    logger.warning(f"Failed to load image {sample['url']}: {e}")
-                    continue
-
-            samples.append(sample)
-
-            if max_samples and len(samples) >= max_samples:
-                break
-
-        logger.info(f"Loaded {len(samples)} samples")
-
         # Determine batch size
         if self.batch_size:
             batch_size = self.batch_size
         else:
             # Get from first worker
-            batch_size = ray.get(self.workers[0].batch_size.remote())
+            batch_size = ray.get(self.workers[0].get_batch_size.remote())
+
+        # Batches are assembled (shard reads, image fetches) on a producer
+        # thread so ready batches are waiting whenever a worker frees up
+        num_slots = self.num_workers * TASKS_PER_WORKER
+        batches = prefetch_iterator(
+            self._iterate_batches(data_loader, batch_size, load_images, max_samples),
+            depth=num_slots,
+            name="batch-producer",
+        )
 
-        # Process in batches
-        all_results = []
-        futures = []
+        # The pool hands each batch to whichever worker freed up first. Every
+        # worker is entered TASKS_PER_WORKER times so it always has a batch
+        # queued behind the one it is running. Batches are submitted one at a
+        # time (rather than map_unordered, which drains its input eagerly) so
+        # only the in-flight batches are held in memory.
+        pool = ActorPool(self.workers * TASKS_PER_WORKER)
 
-        for i in tqdm(range(0, len(samples), batch_size), desc="Processing batches"):
-            batch = samples[i : i + batch_size]
+        # Results are buffered only until a row group's worth is ready, then
+        # appended to the output file while inference continues
+        pending_results: List[Dict[str, Any]] = []
+        pending_rows = 0
 
-            # Assign to worker (round-robin)
-            worker_idx = (i // batch_size) % self.num_workers
-            worker = self.workers[worker_idx]
+        # Progress is logged periodically from the completion path instead of
+        # redrawing a progress bar on every batch
+        start_time = time.time()
+        last_log = start_time
+        completed_batches = 0
+        completed_rows = 0
+
+        # The output file is opened once the first results fix the embedding
+        # length
+        parquet_writer: Optional[ParquetStreamWriter] = None
+
+        def write(table: pa.Table) -> None:
+            nonlocal parquet_writer
+            if parquet_writer is None:
+                embedding_type = table.schema.field("embedding").type
+                parquet_writer = output_writer.open_parquet(
+                    "embeddings.parquet",
+                    output_schema(
+                        self.embedding_dtype,
+                        embedding_type.list_size
+                        if pa.types.is_fixed_size_list(embedding_type)
+                        else None,
+                    ),
+                )
+            parquet_writer.write_table(table)
+
+        def flush() -> None:
+            nonlocal pending_rows
+            if pending_rows:
+                write(self._results_to_table(pending_results, self.embedding_dtype))
+            pending_results.clear()
+            pending_rows = 0
+
+        def collect_one() -> None:
+            nonlocal pending_rows, last_log, completed_batches, completed_rows
+            result = pool.get_next_unordered()
+            pending_results.append(result)
+            pending_rows += result["rows"].num_rows
+            if pending_rows >= OUTPUT_ROW_GROUP_SIZE:
+                flush()
+
+            completed_batches += 1
+            completed_rows += result["rows"].num_rows
+            now = time.time()
+            if now - last_log >= PROGRESS_LOG_INTERVAL_S:
+                last_log = now
+                logger.info(
+                    f"Progress: {completed_rows} samples in {completed_batches} "
+                    f"batches ({completed_rows / (now - start_time):.1f} samples/s)"
+                )
 
-            # Submit batch
-            future = worker.process_batch.remote(batch)
-            futures.append(future)
+        try:
+            for batch in batches:
+                if not pool.has_free():
+                    collect_one()
+                pool.submit(lambda worker, b: worker.process_batch.remote(*b), batch)
 
-            # Collect results periodically to avoid memory buildup
-            if len(futures) >= self.num_workers * 2:
-                ready_futures, futures = ray.wait(
-                    futures, num_returns=len(futures) // 2
-                )
-                batch_results = ray.get(ready_futures)
-                for results in batch_results:
-                    all_results.extend(results)
+            # Collect remaining results
+            while pool.has_next():
+                collect_one()
+            flush()
 
-        # Collect remaining results
-        if futures:
-            batch_results = ray.get(futures)
-            for results in batch_results:
-                all_results.extend(results)
+            if parquet_writer is None:
+                write(self._results_to_table([], self.embedding_dtype))
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+        num_samples = parquet_writer.num_rows
 
-        logger.info(f"Processed {len(all_results)} samples")
+        logger.info(f"Processed {num_samples} samples")
 
-        # Save results
-        self._save_results(all_results, output_writer)
+        # Write metadata
+        metadata = {
+            "num_samples": num_samples,
+            "model": self.model_directory,
+            "embedding_dtype": self.embedding_dtype,
+            "timestamp": time.time(),
+        }
+        output_writer.write_json(metadata, "metadata.json")
 
         logger.info(f"Results saved to {output_writer.output_dir}")
 
-    def _save_results(
-        self, results: List[Dict[str, Any]], output_writer: UnifiedOutputWriter
-    ) -> None:
-        """Save results to output.
+    def _iterate_batches(
+        self,
+        data_loader: UnifiedDataLoader,
+        batch_size: int,
+        load_images: bool,
+        max_samples: Optional[int],
+    ) -> Iterator[Tuple[pa.Table, List[Optional[np.ndarray]]]]:
+        """Stream columnar batches from the loader along with their images.
+
+        Samples are fetched only as batches are consumed, so at most the
+        in-flight batches are held in memory rather than the whole dataset.
 
         Args:
-            results: List of result dicts
-            output_writer: Output writer
+            data_loader: Data loader
+            batch_size: Number of samples per batch
+            load_images: Whether to fetch image bytes for each sample
+            max_samples: Max samples to read (None = all)
+
+        Yields:
+            Tuples of (batch of up to batch_size rows, one image per row)
         """
-        # Prepare DataFrame
-        df_data = []
-        for result in results:
-            row = {
-                "url": result["url"],
-                "key": result.get("key", ""),
-                "caption": result.get("caption", ""),
-                "embedding": result["embedding"],
-            }
-            # Add metadata columns
-            for k, v in result.get("metadata", {}).items():
-                row[f"meta_{k}"] = v
+        batches = data_loader.iterate_batches(batch_size, max_samples)
+        if load_images:
+            batches = self._fetch_images(data_loader, batches)
+        else:
+            batches = ((batch, [None] * batch.num_rows) for batch in batches)
 
-            df_data.append(row)
+        num_samples = 0
+        for batch, images in batches:
+            # Skip batches whose images all failed to load
+            if batch.num_rows:
+                num_samples += batch.num_rows
+                yield batch, images
 
-        df = pd.DataFrame(df_data)
+        logger.info(f"Loaded {num_samples} samples")
 
-        # Write parquet
-        output_writer.write_parquet(df, "embeddings.parquet")
+    def _fetch_images(
+        self, data_loader: UnifiedDataLoader, batches: Iterable[pa.Table]
+    ) -> Iterator[Tuple[pa.Table, List[np.ndarray]]]:
+        """Fetch images for batches concurrently, preserving order.
 
-        # Write metadata
-        metadata = {
-            "num_samples": len(results),
-            "model": self.model_directory,
-            "timestamp": time.time(),
+        Fetches for the next batches are queued while the oldest one
+        completes, keeping about twice ``fetch_threads`` fetches in flight;
+        the batch stream is still consumed lazily.
+
+        Args:
+            data_loader: Data loader
+            batches: Columnar batches to fetch images for
+
+        Yields:
+            Tuples of (batch, images): each image is its encoded bytes as a
+            uint8 array, or an HWC array for pre-decoded ``.npy`` images.
+            Rows whose image fails to load are logged and dropped
+        """
+        window = self.fetch_threads * 2
+        pending: Deque[Tuple[pa.Table, List[Future]]] = deque()
+        in_flight = 0
+        executor = ThreadPoolExecutor(
+            max_workers=self.fetch_threads, thread_name_prefix="image-fetch"
+        )
+
+        def fetch(url: str) -> np.ndarray:
+            if url.endswith(RAW_IMAGE_SUFFIX):
+                return data_loader.load_image_array(url)
+            # A uint8 array rather than bytes: Ray ships numpy buffers
+            # out-of-band through the shared-memory object store, so workers
+            # read them without a pickle copy
+            return np.frombuffer(data_loader.fetch_image_bytes(url), dtype=np.uint8)
+
+        def finish(
+            batch: pa.Table, futures: List[Future]
+        ) -> Tuple[pa.Table, List[np.ndarray]]:
+            keep, images = [], []
+            for i, (url, future) in enumerate(
+                zip(batch.column("url").to_pylist(), futures)
+            ):
+                try:
+                    images.append(future.result())
+                    keep.append(i)
+                except Exception as e:
+                    logger.warning(f"Failed to load image {url}: {e}")
+            if len(keep) < batch.num_rows:
+                batch = batch.take(pa.array(keep, type=pa.int64()))
+            return batch, images
+
+        try:
+            for batch in batches:
+                futures = [
+                    executor.submit(fetch, url) for url in batch.column("url").to_pylist()
+                ]
+                pending.append((batch, futures))
+                in_flight += len(futures)
+
+                # Block on the oldest batch only while enough fetches stay
+                # queued behind it to keep the pool busy
+                while pending and in_flight - len(pending[0][1]) >= window:
+                    batch, futures = pending.popleft()
+                    in_flight -= len(futures)
+                    yield finish(batch, futures)
+
+            while pending:
+                yield finish(*pending.popleft())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _results_to_table(
+        results: List[Dict[str, Any]], embedding_dtype: str = "float32"
+    ) -> pa.Table:
+        """Build an Arrow table from columnar batch results.
+
+        Embeddings arrive already in their storage type; fixed-length ones are
+        stored as a ``FixedSizeList`` column built from one contiguous array.
+        Metadata columns keep their Arrow types under a ``meta_`` prefix.
+
+        Args:
+            results: Batch results as returned by
+                ``BatchInferenceWorker.process_batch``
+            embedding_dtype: Storage type the workers produced
+
+        Returns:
+            Arrow table with url, key, caption, embedding and metadata columns
+        """
+        tables = [r["rows"] for r in results if r["rows"].num_rows]
+        if tables:
+            rows = pa.concat_tables(tables, promote_options="permissive")
+        else:
+            rows = pa.table(
+                {name: pa.array([], type=pa.string()) for name in SAMPLE_COLUMNS}
+            )
+
+        columns: Dict[str, Any] = {
+            name: rows.column(name).cast(pa.string())
+            for name in ("url", "key", "caption")
         }
-        output_writer.write_json(metadata, "metadata.json")
+        columns.update(embedding_columns(results, embedding_dtype))
+        for name in rows.column_names:
+            if name not in SAMPLE_COLUMNS:
+                columns[f"meta_{name}"] = rows.column(name)
+
+        return pa.table(columns)
 
 
 def main():
@@ -582,6 +1815,34 @@ def main():
         "--env", default="prod", choices=["dev", "prod"], help="Environment"
     )
     parser.add_argument("--aws_region", default="us-east-1", help="AWS region")
+    parser.add_argument(
+        "--prefetch_shards",
+        type=int,
+        default=4,
+        help="Number of parquet shards read ahead of processing (first row group each)",
+    )
+    parser.add_argument(
+        "--shard_cache",
+        default=None,
+        help="Local JSON file caching the input shard list across runs",
+    )
+    parser.add_argument(
+        "--metadata_columns",
+        default=None,
+        help="Comma-separated metadata columns to read (default: all)",
+    )
+    parser.add_argument(
+        "--embedding_dtype",
+        default="float32",
+        choices=sorted(EMBEDDING_DTYPES),
+        help="Storage type for output embeddings",
+    )
+    parser.add_argument(
+        "--fetch_threads",
+        type=int,
+        default=IMAGE_FETCH_THREADS,
+        help="Number of threads fetching images concurrently",
+    )
 
     args = parser.parse_args()
 
@@ -594,6 +1855,11 @@ def main():
     # Setup logging
     setup_logging(config.logging)
     logger.info("Starting batch inference service")
+
+    # Parquet column chunks are decompressed and decoded in parallel on
+    # Arrow's CPU pool; size it to the CPUs this process may run on
+    if hasattr(os, "sched_getaffinity"):
+        pa.set_cpu_count(len(os.sched_getaffinity(0)))
     logger.info(f"Model: {args.model_directory}")
     logger.info(f"Input: {args.input_dir}")
     logger.info(f"Output: {args.output_dir}")
@@ -604,10 +1870,18 @@ def main():
     logger.info(f"Initializing Ray with {num_gpus} GPUs")
     ray.init(num_gpus=num_gpus)
 
+    data_loader = None
     try:
         # Create data loader
         data_loader = UnifiedDataLoader(
-            input_dir=args.input_dir, aws_region=args.aws_region
+            input_dir=args.input_dir,
+            aws_region=args.aws_region,
+            prefetch_depth=args.prefetch_shards,
+            shard_cache=args.shard_cache,
+            metadata_columns=(
+                args.metadata_columns.split(",") if args.metadata_columns else None
+            ),
+            fetch_threads=args.fetch_threads,
         )
 
         # Create output writer
@@ -621,6 +1895,8 @@ def main():
             config=config,
             num_workers=args.num_workers,
             batch_size=args.batch_size,
+            fetch_threads=args.fetch_threads,
+            embedding_dtype=args.embedding_dtype,
         )
 
         # Process dataset
@@ -638,6 +1914,8 @@ def main():
         logger.error(f"Batch inference failed: {e}", exc_info=True)
         raise
     finally:
+        if data_loader is not None:
+            data_loader.close()
         ray.shutdown()
         logger.info("Ray shutdown complete")
 
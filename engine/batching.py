@@ -0,0 +1,77 @@
+"""Adaptive dynamic batching policy."""
+
+from typing import Optional
+
+# Weight of the newest observation in the moving averages
+EWMA_ALPHA = 0.2
+
+
+class AdaptiveBatchPolicy:
+    """Adapts the batch size limit and fill wait to the observed load.
+
+    The size limit doubles (up to the model's batch size) while requests
+    back up behind full batches, and halves when batches keep coming out
+    less than half full. The time spent waiting for a batch to fill shrinks
+    toward zero as a backlog builds, since the next batch is then ready
+    anyway, and never exceeds half the average processing time.
+
+    The observed throughput also gives the expected queueing delay, which
+    the worker uses to turn away requests that would time out anyway.
+    """
+
+    def __init__(self, max_batch_size: int, max_wait_s: float):
+        """Initialize policy.
+
+        Args:
+            max_batch_size: Upper bound on the batch size (the model's)
+            max_wait_s: Upper bound on the time spent filling a batch
+        """
+        self.max_batch_size = max(1, max_batch_size)
+        self.base_wait_s = max_wait_s
+        self.batch_size = self.max_batch_size
+        self.wait_s = max_wait_s
+        self._fill = 1.0
+        self._depth = 0.0
+        self._process_s: Optional[float] = None
+        # Requests processed per second
+        self._throughput: Optional[float] = None
+
+    def update(self, batch_size: int, queue_depth: int, process_s: float) -> None:
+        """Adjust the limits after a batch has been processed.
+
+        Args:
+            batch_size: Size of the processed batch
+            queue_depth: Requests left waiting after it was taken
+            process_s: Time taken to process it in seconds
+        """
+        self._fill += EWMA_ALPHA * (batch_size / self.batch_size - self._fill)
+        self._depth += EWMA_ALPHA * (queue_depth - self._depth)
+        throughput = batch_size / max(process_s, 1e-6)
+        if self._process_s is None:
+            self._process_s = process_s
+            self._throughput = throughput
+        else:
+            self._process_s += EWMA_ALPHA * (process_s - self._process_s)
+            self._throughput += EWMA_ALPHA * (throughput - self._throughput)
+
+        if queue_depth > self.batch_size and self.batch_size < self.max_batch_size:
+            self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+            self._fill = min(1.0, self._fill / 2)
+        elif self._fill < 0.5 and self.batch_size > 1:
+            self.batch_size //= 2
+            self._fill = min(1.0, self._fill * 2)
+
+        self.wait_s = min(self.base_wait_s, self._process_s / 2) / (1 + self._depth)
+
+    def expected_wait_s(self, queue_depth: int) -> float:
+        """Estimate how long a new request would wait behind the queue.
+
+        Args:
+            queue_depth: Requests currently waiting
+
+        Returns:
+            Expected wait in seconds (0 until a batch has been processed)
+        """
+        if not self._throughput:
+            return 0.0
+        return queue_depth / self._throughput
@@ -33,6 +33,9 @@ class ServerConfig(BaseSettings):
     max_queue_size: int = 1024
     request_timeout_s: int = 30
     shutdown_timeout_s: int = 60
+    # Reject requests up front when the expected queue wait exceeds this
+    # fraction of request_timeout_s (0 disables)
+    admission_wait_fraction: float = 0.9
 
 
 class LoggingConfig(BaseSettings):
@@ -41,6 +44,9 @@ class LoggingConfig(BaseSettings):
     level: str = "INFO"
     format: str = "json"
     output: str = "stdout"
+    # Records buffered per write (0 writes each record immediately)
+    buffer_size: int = 512
+    flush_interval_s: float = 1.0
 
     @field_validator("level")
     @classmethod
@@ -75,6 +81,21 @@ class ModelsConfig(BaseSettings):
     default_batch_size: int = 16
     default_batch_wait_s: float = 0.003
     warmup_enabled: bool = True
+    # Let models that support it replay their forward pass as CUDA graphs
+    cuda_graph_enabled: bool = True
+    # Inference precision for models with to_dtype(); "auto" keeps the
+    # model's own choice
+    dtype: str = "auto"
+
+    @field_validator("dtype")
+    @classmethod
+    def validate_dtype(cls, v: str) -> str:
+        """Validate inference precision."""
+        valid_dtypes = ["auto", "fp32", "fp16", "bf16", "int8"]
+        v = v.lower()
+        if v not in valid_dtypes:
+            raise ValueError(f"Invalid dtype: {v}. Must be one of {valid_dtypes}")
+        return v
 
 
 class SecurityConfig(BaseSettings):
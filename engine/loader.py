@@ -1,17 +1,55 @@
 """Enhanced model loader with validation."""
 
-import json
 import os
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
+from types import ModuleType
 from typing import Any, Dict, Tuple
 
+import orjson
+
 from engine.exceptions import ConfigurationError, ModelLoadError, ModelNotFoundError
 from engine.logging import get_logger
 from engine.types import ModelInfo
 
 logger = get_logger(__name__)
 
+# Executed model.py modules keyed by (resolved path, mtime_ns); an edited
+# file gets a new key and is executed again
+_module_cache: Dict[Tuple[str, int], ModuleType] = {}
+
+
+def _load_module(model_py_path: Path) -> ModuleType:
+    """Execute model.py, reusing the module if the file is unchanged.
+
+    Args:
+        model_py_path: Path to model.py
+
+    Returns:
+        Module defining ModelImpl
+
+    Raises:
+        ModelLoadError: If the module cannot be loaded or has no ModelImpl
+    """
+    key = (str(model_py_path.resolve()), model_py_path.stat().st_mtime_ns)
+    module = _module_cache.get(key)
+    if module is not None:
+        logger.debug(f"Using cached module for {model_py_path}")
+        return module
+
+    spec = spec_from_file_location("model_impl", str(model_py_path))
+    if spec is None or spec.loader is None:
+        raise ModelLoadError(f"Failed to load module spec from {model_py_path}")
+
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    if not hasattr(module, "ModelImpl"):
+        raise ModelLoadError("model.py must define ModelImpl class")
+
+    _module_cache[key] = module
+    return module
+
 
 def load_model(model_dir: str) -> Tuple[ModelInfo, Any]:
     """Load model from directory.
@@ -44,9 +82,9 @@ def load_model(model_dir: str) -> Tuple[ModelInfo, Any]:
         raise ConfigurationError(f"config.json not found in {model_dir}")
 
     try:
-        with open(config_path) as f:
-            config_data = json.load(f)
-    except json.JSONDecodeError as e:
+        with open(config_path, "rb") as f:
+            config_data = orjson.loads(f.read())
+    except orjson.JSONDecodeError as e:
         raise ConfigurationError(f"Invalid config.json: {e}")
     except Exception as e:
         raise ConfigurationError(f"Failed to read config.json: {e}")
@@ -76,16 +114,7 @@ def load_model(model_dir: str) -> Tuple[ModelInfo, Any]:
         raise ModelLoadError(f"model.py not found in {model_dir}")
 
     try:
-        spec = spec_from_file_location("model_impl", str(model_py_path))
-        if spec is None or spec.loader is None:
-            raise ModelLoadError(f"Failed to load module spec from {model_py_path}")
-
-        module = module_from_spec(spec)
-        spec.loader.exec_module(module)
-
-        if not hasattr(module, "ModelImpl"):
-            raise ModelLoadError("model.py must define ModelImpl class")
-
+        module = _load_module(model_py_path)
         model_instance = module.ModelImpl()
         logger.info(f"Model implementation loaded: {model_info.name}")
 
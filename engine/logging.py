@@ -1,10 +1,11 @@
 """Structured logging configuration."""
 
-import json
 import logging
 import sys
-from datetime import datetime
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional, TextIO
+
+import orjson
 
 from engine.config import LoggingConfig
 
@@ -22,7 +23,8 @@ class JSONFormatter(logging.Formatter):
             JSON formatted log string
         """
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # Epoch seconds already captured on the record
+            "timestamp": record.created,
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -42,7 +44,7 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "batch_size"):
             log_data["batch_size"] = record.batch_size
 
-        return json.dumps(log_data)
+        return orjson.dumps(log_data, default=str).decode()
 
 
 class PlainFormatter(logging.Formatter):
@@ -53,6 +55,86 @@ class PlainFormatter(logging.Formatter):
         super().__init__(fmt=fmt, datefmt="%Y-%m-%d %H:%M:%S")
 
 
+class BufferedStreamHandler(logging.StreamHandler):
+    """Stream handler that writes records in batches.
+
+    Records are formatted as they arrive and written with one write() and
+    flush() when ``capacity`` records are buffered, when a record at ERROR or
+    above arrives, or every ``flush_interval_s`` seconds.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        capacity: int = 512,
+        flush_interval_s: float = 1.0,
+        close_stream: bool = False,
+    ):
+        """Initialize handler.
+
+        Args:
+            stream: Text stream to write to
+            capacity: Number of records buffered before writing
+            flush_interval_s: Maximum time a record stays buffered
+            close_stream: Whether close() also closes the stream
+        """
+        super().__init__(stream)
+        self.capacity = capacity
+        self._buffer: List[str] = []
+        self._close_stream = close_stream
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(flush_interval_s,),
+            name="log-flush",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self, interval_s: float) -> None:
+        """Flush thread: write whatever is buffered every interval."""
+        while not self._stopped.wait(interval_s):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer a formatted record, writing the buffer when due.
+
+        Args:
+            record: Log record
+        """
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+
+        if len(self._buffer) >= self.capacity or record.levelno >= logging.ERROR:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to the stream."""
+        self.acquire()
+        try:
+            if self._buffer:
+                self.stream.write(
+                    self.terminator.join(self._buffer) + self.terminator
+                )
+                self._buffer.clear()
+                self.stream.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Write remaining records and stop the flush thread."""
+        self._stopped.set()
+        try:
+            self.flush()
+            if self._close_stream:
+                self.stream.close()
+        finally:
+            super().close()
+
+
 def setup_logging(config: Optional[LoggingConfig] = None) -> None:
     """Setup logging configuration.
 
@@ -71,9 +153,22 @@ def setup_logging(config: Optional[LoggingConfig] = None) -> None:
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
-
-    # Create handler
-    if config.output == "stdout":
+        if isinstance(handler, BufferedStreamHandler):
+            handler.close()
+
+    # Create handler; buffered output batches writes (and syscalls)
+    if config.buffer_size > 0:
+        if config.output == "stdout":
+            stream, close_stream = sys.stdout, False
+        else:
+            stream, close_stream = open(config.output, "a", encoding="utf-8"), True
+        handler = BufferedStreamHandler(
+            stream,
+            capacity=config.buffer_size,
+            flush_interval_s=config.flush_interval_s,
+            close_stream=close_stream,
+        )
+    elif config.output == "stdout":
         handler = logging.StreamHandler(sys.stdout)
     else:
         handler = logging.FileHandler(config.output)
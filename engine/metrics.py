@@ -1,7 +1,7 @@
 """Metrics collection and export."""
 
 import time
-from typing import Dict
+from typing import Dict, Sequence
 
 from prometheus_client import Counter, Gauge, Histogram, generate_latest
 
@@ -75,6 +75,18 @@ class MetricsCollector:
         """
         self.model_name = model_name
 
+        # Bind label children once; labels() hashes and locks on every call
+        self._request_duration = request_duration.labels(model=model_name)
+        self._batch_size = batch_size_histogram.labels(model=model_name)
+        self._batch_wait = batch_wait_time.labels(model=model_name)
+        self._queue_depth = queue_depth.labels(model=model_name)
+        self._queue_rejections = queue_rejections.labels(model=model_name)
+        self._requests: Dict[str, Counter] = {
+            status: request_counter.labels(model=model_name, status=status)
+            for status in ("success", "error", "timeout")
+        }
+        self._errors: Dict[str, Counter] = {}
+
     def record_request(self, status: str, duration: float) -> None:
         """Record request metrics.
 
@@ -82,8 +94,33 @@ class MetricsCollector:
             status: Request status (success, error, timeout)
             duration: Request duration in seconds
         """
-        request_counter.labels(model=self.model_name, status=status).inc()
-        request_duration.labels(model=self.model_name).observe(duration)
+        counter = self._requests.get(status)
+        if counter is None:
+            counter = self._requests[status] = request_counter.labels(
+                model=self.model_name, status=status
+            )
+        counter.inc()
+        self._request_duration.observe(duration)
+
+    def record_requests(self, status: str, durations: Sequence[float]) -> None:
+        """Record metrics for a batch of requests with one counter update.
+
+        Args:
+            status: Status shared by the requests
+            durations: Request durations in seconds
+        """
+        if not durations:
+            return
+        counter = self._requests.get(status)
+        if counter is None:
+            counter = self._requests[status] = request_counter.labels(
+                model=self.model_name, status=status
+            )
+        counter.inc(len(durations))
+        # Histogram buckets still need each value
+        observe = self._request_duration.observe
+        for duration in durations:
+            observe(duration)
 
     def record_batch(self, size: int, wait_time: float) -> None:
         """Record batch metrics.
@@ -92,8 +129,8 @@ class MetricsCollector:
             size: Batch size
             wait_time: Time waited to form batch
         """
-        batch_size_histogram.labels(model=self.model_name).observe(size)
-        batch_wait_time.labels(model=self.model_name).observe(wait_time)
+        self._batch_size.observe(size)
+        self._batch_wait.observe(wait_time)
 
     def update_queue_depth(self, depth: int) -> None:
         """Update queue depth metric.
@@ -101,11 +138,11 @@ class MetricsCollector:
         Args:
             depth: Current queue depth
         """
-        queue_depth.labels(model=self.model_name).set(depth)
+        self._queue_depth.set(depth)
 
     def record_queue_rejection(self) -> None:
         """Record queue rejection."""
-        queue_rejections.labels(model=self.model_name).inc()
+        self._queue_rejections.inc()
 
     def record_model_load(self, duration: float) -> None:
         """Record model load time.
@@ -129,7 +166,12 @@ class MetricsCollector:
         Args:
             error_type: Type of error
         """
-        error_counter.labels(model=self.model_name, error_type=error_type).inc()
+        counter = self._errors.get(error_type)
+        if counter is None:
+            counter = self._errors[error_type] = error_counter.labels(
+                model=self.model_name, error_type=error_type
+            )
+        counter.inc()
 
 
 def get_metrics() -> bytes:
@@ -0,0 +1,198 @@
+"""Fused image preprocessing kernels.
+
+Converts batches of decoded RGB images into normalized float32 CHW arrays in
+a single pass. Uses Numba when it is installed and falls back to numpy
+otherwise.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+import numpy as np
+from PIL import Image
+
+from engine.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Shared pool for per-image PIL work, created on first use
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _normalize_kernel(images, scale, bias, out):
+        """uint8 NHWC -> float32 NCHW with per-channel scale and bias."""
+        batch, height, width, channels = images.shape
+        for b in prange(batch):
+            for c in range(channels):
+                s = scale[c]
+                o = bias[c]
+                for y in range(height):
+                    for x in range(width):
+                        out[b, c, y, x] = images[b, y, x, c] * s + o
+
+
+def _normalize_numpy(
+    images: np.ndarray, scale: np.ndarray, bias: np.ndarray, out: np.ndarray
+) -> None:
+    """Numpy fallback for the normalization kernel."""
+    np.multiply(
+        images.transpose(0, 3, 1, 2), scale[:, None, None], out=out, casting="unsafe"
+    )
+    out += bias[:, None, None]
+
+
+def normalize_images(
+    images: np.ndarray,
+    mean: Sequence[float],
+    std: Sequence[float],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Normalize a batch of uint8 RGB images into a float32 CHW array.
+
+    Computes ``(images / 255 - mean) / std`` and transposes HWC to CHW in one
+    pass over memory.
+
+    Args:
+        images: uint8 array of shape (B, H, W, 3)
+        mean: Per-channel mean (in [0, 1] units)
+        std: Per-channel standard deviation (in [0, 1] units)
+        out: Optional float32 array of shape (B, 3, H, W) to write into
+            (e.g. a view of a pinned tensor)
+
+    Returns:
+        float32 array of shape (B, 3, H, W)
+
+    Raises:
+        ValueError: If the input or output arrays have the wrong shape or dtype
+    """
+    if images.dtype != np.uint8 or images.ndim != 4 or images.shape[-1] != 3:
+        raise ValueError(
+            f"Expected uint8 images of shape (B, H, W, 3), "
+            f"got {images.dtype} {images.shape}"
+        )
+
+    batch, height, width, _ = images.shape
+    if out is None:
+        out = np.empty((batch, 3, height, width), dtype=np.float32)
+    elif out.dtype != np.float32 or out.shape != (batch, 3, height, width):
+        raise ValueError(
+            f"Expected float32 output of shape {(batch, 3, height, width)}, "
+            f"got {out.dtype} {out.shape}"
+        )
+
+    std = np.asarray(std, dtype=np.float32)
+    scale = 1.0 / (255.0 * std)
+    bias = -np.asarray(mean, dtype=np.float32) / std
+
+    if NUMBA_AVAILABLE:
+        _normalize_kernel(images, scale, bias, out)
+    else:
+        _normalize_numpy(images, scale, bias, out)
+
+    return out
+
+
+def resize_center_crop(image: Image.Image, size: int) -> Image.Image:
+    """Resize the shortest side to ``size`` (bicubic) and center-crop a square.
+
+    Args:
+        image: PIL Image
+        size: Output side length
+
+    Returns:
+        PIL Image of size (size, size)
+    """
+    width, height = image.size
+    scale = size / min(width, height)
+    new_width = max(size, int(width * scale))
+    new_height = max(size, int(height * scale))
+
+    if (new_width, new_height) != (width, height):
+        image = image.resize((new_width, new_height), Image.Resampling.BICUBIC)
+
+    left = (new_width - size) // 2
+    top = (new_height - size) // 2
+    return image.crop((left, top, left + size, top + size))
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Return the shared preprocessing thread pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1, thread_name_prefix="preprocess"
+            )
+        return _pool
+
+
+def parallel_map(fn: Callable[[T], R], items: Sequence[T]) -> List[R]:
+    """Apply ``fn`` to each item on the shared preprocessing thread pool.
+
+    Meant for per-image work that releases the GIL (PIL decoding and
+    resampling). Single items run inline.
+
+    Args:
+        fn: Function to apply
+        items: Inputs
+
+    Returns:
+        Results in input order
+    """
+    if len(items) > 1:
+        return list(_get_pool().map(fn, items))
+    return [fn(item) for item in items]
+
+
+def crop_images(
+    images: Sequence[Image.Image], size: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Resize and center-crop a batch of images into one uint8 array.
+
+    PIL releases the GIL while resampling, so images are processed in
+    parallel on a shared thread pool, each written straight into its row.
+
+    Args:
+        images: PIL Images (converted to RGB as needed)
+        size: Output side length
+        out: Optional uint8 array of shape (N, size, size, 3) to write into
+            (e.g. a view of a pinned tensor)
+
+    Returns:
+        uint8 array of shape (N, size, size, 3)
+    """
+    if out is None:
+        out = np.empty((len(images), size, size, 3), dtype=np.uint8)
+
+    def fill(i: int) -> None:
+        image = images[i]
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        out[i] = np.asarray(resize_center_crop(image, size))
+
+    parallel_map(fill, range(len(images)))
+    return out
+
+
+def warmup() -> None:
+    """Compile the Numba kernel ahead of the first real batch."""
+    normalize_images(
+        np.zeros((1, 2, 2, 3), dtype=np.uint8), (0.5, 0.5, 0.5), (0.5, 0.5, 0.5)
+    )
+    logger.debug(f"Preprocessing kernels ready (numba={NUMBA_AVAILABLE})")
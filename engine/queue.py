@@ -1,8 +1,12 @@
 """Enhanced request queue with monitoring."""
 
 import asyncio
+import heapq
+import itertools
+import logging
 import time
-from typing import List, Optional
+from collections import deque
+from typing import Deque, List, Optional, Tuple
 
 from engine.exceptions import QueueFullError
 from engine.logging import get_logger
@@ -10,9 +14,20 @@ from engine.types import InferenceRequest
 
 logger = get_logger(__name__)
 
+# Sort key for requests without a deadline: after any real monotonic_ns value
+_NO_DEADLINE = 1 << 63
+
 
 class RequestQueue:
-    """Request queue with monitoring and metrics."""
+    """Request queue with monitoring and metrics.
+
+    Requests are served highest ``priority`` first and, within a priority,
+    earliest ``deadline_ns`` first (FIFO when all requests share a timeout).
+    Requests whose deadline has passed are failed with ``TimeoutError``
+    instead of being batched, and those whose caller has given up are
+    dropped. ``expire`` also fails requests that are past their deadline
+    while being processed, so callers need no timer of their own.
+    """
 
     def __init__(self, maxsize: int = 1024):
         """Initialize request queue.
@@ -20,11 +35,28 @@ class RequestQueue:
         Args:
             maxsize: Maximum queue size
         """
-        self.q = asyncio.Queue(maxsize=maxsize)
         self.maxsize = maxsize
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all requests and zero the counters.
+
+        Pending futures are left untouched; use ``drain`` to get them first.
+        """
+        # Heap of (-priority, deadline, sequence, request); the sequence keeps
+        # equal keys FIFO. The event wakes a waiting consumer and is set
+        # whenever the heap is non-empty (recreated so that it can be used
+        # from a different event loop)
+        self._heap: List[Tuple[int, int, int, InferenceRequest]] = []
+        self._sequence = itertools.count()
+        self._not_empty = asyncio.Event()
+        # Requests with a deadline, in arrival order, until they finish or
+        # expire; with one timeout for all requests this is deadline order
+        self._deadlines: Deque[InferenceRequest] = deque()
         self._total_requests = 0
         self._total_rejections = 0
         self._total_timeouts = 0
+        self._total_expired = 0
 
     async def put(self, req: InferenceRequest) -> None:
         """Add request to queue.
@@ -35,14 +67,7 @@ class RequestQueue:
         Raises:
             QueueFullError: If queue is full
         """
-        try:
-            self.q.put_nowait(req)
-            self._total_requests += 1
-            logger.debug(
-                f"Request enqueued: {req.request_id}, queue_depth={self.depth()}",
-                extra={"request_id": req.request_id},
-            )
-        except asyncio.QueueFull:
+        if self.maxsize > 0 and len(self._heap) >= self.maxsize:
             self._total_rejections += 1
             logger.warning(
                 f"Queue full, rejecting request: {req.request_id}",
@@ -50,6 +75,85 @@ class RequestQueue:
             )
             raise QueueFullError("Request queue is full", queue_depth=self.depth())
 
+        if req.deadline_ns is None:
+            deadline = _NO_DEADLINE
+        else:
+            deadline = req.deadline_ns
+            self._deadlines.append(req)
+        heapq.heappush(self._heap, (-req.priority, deadline, next(self._sequence), req))
+        self._not_empty.set()
+        self._total_requests += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Request enqueued: {req.request_id}, queue_depth={self.depth()}",
+                extra={"request_id": req.request_id},
+            )
+
+    def _pop(self) -> Optional[InferenceRequest]:
+        """Remove and return the next live request.
+
+        Expired requests are failed with ``TimeoutError`` and requests whose
+        future is already done (e.g. cancelled by the caller) are dropped.
+
+        Returns:
+            The next request, or None if the queue holds no live requests
+        """
+        heap = self._heap
+        now_ns = time.monotonic_ns()
+        while heap:
+            _, deadline, _, req = heapq.heappop(heap)
+            if req.future.done():
+                continue
+            if deadline <= now_ns:
+                self._fail_expired(req)
+                continue
+            return req
+        return None
+
+    def _fail_expired(self, req: InferenceRequest) -> None:
+        """Fail a request that has passed its deadline."""
+        self._total_expired += 1
+        req.future.set_exception(
+            asyncio.TimeoutError(f"Request {req.request_id} passed its deadline")
+        )
+
+    def expire(self) -> int:
+        """Fail requests that have passed their deadline.
+
+        Covers requests still queued and those already taken into a batch;
+        finished requests are forgotten. Only the oldest requests are
+        checked, so this is cheap enough to call periodically.
+
+        Returns:
+            Number of requests failed
+        """
+        deadlines = self._deadlines
+        now_ns = time.monotonic_ns()
+        expired = 0
+        while deadlines:
+            req = deadlines[0]
+            if not req.future.done():
+                if req.deadline_ns > now_ns:
+                    break
+                self._fail_expired(req)
+                expired += 1
+            deadlines.popleft()
+        return expired
+
+    def _take(self, batch: List[InferenceRequest], max_size: int) -> None:
+        """Move live requests into ``batch`` until it holds ``max_size``.
+
+        Args:
+            batch: Batch to extend in place
+            max_size: Maximum batch size
+        """
+        while len(batch) < max_size and self._heap:
+            req = self._pop()
+            if req is not None:
+                batch.append(req)
+        if not self._heap:
+            self._not_empty.clear()
+
     async def get_batch(
         self, batch_size: int, timeout_s: float
     ) -> List[InferenceRequest]:
@@ -62,40 +166,103 @@ class RequestQueue:
         Returns:
             List of inference requests
         """
+        start_ns = time.monotonic_ns()
+        deadline = time.monotonic() + timeout_s
+
+        # Wait for a live request (another consumer may win the race, or
+        # everything queued may have expired, so re-check until the deadline),
+        # then take whatever is queued, up to the batch size
         batch: List[InferenceRequest] = []
-        start_time = time.time()
-
-        try:
-            # Wait for first request
-            first_req = await asyncio.wait_for(self.q.get(), timeout_s)
-            batch.append(first_req)
-        except asyncio.TimeoutError:
-            self._total_timeouts += 1
-            return []
-
-        # Try to get more requests to fill the batch
-        while len(batch) < batch_size:
+        while True:
+            self._take(batch, batch_size)
+            if batch:
+                break
             try:
-                req = self.q.get_nowait()
-                batch.append(req)
-            except asyncio.QueueEmpty:
+                await asyncio.wait_for(
+                    self._not_empty.wait(), deadline - time.monotonic()
+                )
+            except asyncio.TimeoutError:
+                self._total_timeouts += 1
+                return []
+
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = (time.monotonic_ns() - start_ns) / 1_000_000
+            logger.debug(
+                f"Batch created: size={len(batch)}, wait_time_ms={elapsed:.2f}",
+                extra={"batch_size": len(batch), "duration_ms": elapsed},
+            )
+
+        return batch
+
+    async def get(self) -> InferenceRequest:
+        """Wait for and remove the next request.
+
+        Returns:
+            Inference request
+        """
+        while True:
+            req = self._pop()
+            if not self._heap:
+                self._not_empty.clear()
+            if req is not None:
+                return req
+            await self._not_empty.wait()
+
+    async def extend_batch(
+        self, batch: List[InferenceRequest], max_size: int, timeout_s: float
+    ) -> List[InferenceRequest]:
+        """Top up a batch with queued requests.
+
+        Takes whatever is queued (in priority and deadline order), then keeps
+        waiting for new requests until the batch holds ``max_size`` requests
+        or ``timeout_s`` has passed.
+
+        Args:
+            batch: Batch to extend in place
+            max_size: Maximum batch size
+            timeout_s: Maximum time to wait for more requests
+
+        Returns:
+            The extended batch
+        """
+        deadline = time.monotonic() + timeout_s
+
+        while True:
+            self._take(batch, max_size)
+            if len(batch) >= max_size:
                 break
 
-        elapsed = (time.time() - start_time) * 1000
-        logger.debug(
-            f"Batch created: size={len(batch)}, wait_time_ms={elapsed:.2f}",
-            extra={"batch_size": len(batch), "duration_ms": elapsed},
-        )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._not_empty.clear()
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
 
         return batch
 
+    def drain(self) -> List[InferenceRequest]:
+        """Remove every request, e.g. on shutdown.
+
+        Returns:
+            Unfinished requests, queued or already taken into a batch
+        """
+        pending = {id(req): req for *_, req in self._heap}
+        pending.update((id(req), req) for req in self._deadlines)
+        self._heap.clear()
+        self._deadlines.clear()
+        self._not_empty.clear()
+        return [req for req in pending.values() if not req.future.done()]
+
     def depth(self) -> int:
         """Get current queue depth.
 
         Returns:
             Number of items in queue
         """
-        return self.q.qsize()
+        return len(self._heap)
 
     def is_empty(self) -> bool:
         """Check if queue is empty.
@@ -103,7 +270,7 @@ class RequestQueue:
         Returns:
             True if empty
         """
-        return self.q.empty()
+        return not self._heap
 
     def is_full(self) -> bool:
         """Check if queue is full.
@@ -111,7 +278,7 @@ class RequestQueue:
         Returns:
             True if full
         """
-        return self.q.full()
+        return 0 < self.maxsize <= len(self._heap)
 
     def get_metrics(self) -> dict:
         """Get queue metrics.
@@ -125,5 +292,6 @@ class RequestQueue:
             "total_requests": self._total_requests,
             "total_rejections": self._total_rejections,
             "total_timeouts": self._total_timeouts,
+            "total_expired": self._total_expired,
             "utilization": self.depth() / self.maxsize if self.maxsize > 0 else 0,
         }
@@ -1,29 +1,65 @@
 """Enhanced types for inference requests."""
 
+import itertools
+import os
+import secrets
 import time
-import uuid
 from asyncio import Future
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+# Request IDs are "<pid><random>-<counter>" in hex: unique per process, and the
+# random part keeps processes on different hosts apart
+_request_id_prefix = ""
+_request_counter = itertools.count()
 
-@dataclass
+
+def _reset_request_ids() -> None:
+    """Start a fresh request ID sequence for this process."""
+    global _request_id_prefix, _request_counter
+    _request_id_prefix = f"{os.getpid():x}{secrets.token_hex(4)}-"
+    _request_counter = itertools.count()
+
+
+_reset_request_ids()
+os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+def _next_request_id() -> str:
+    """Return a new request ID."""
+    return f"{_request_id_prefix}{next(_request_counter):x}"
+
+
+@dataclass(slots=True)
 class InferenceRequest:
     """Inference request with metadata."""
 
     payload: Dict[str, Any]
     future: Future
-    request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    enqueue_ts: float = field(default_factory=time.time)
+    request_id: str = field(default_factory=_next_request_id)
+    # time.monotonic_ns() at creation: immune to wall-clock jumps, but only
+    # comparable within one host
+    enqueue_ts: int = field(default_factory=time.monotonic_ns)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Higher priorities are batched first
+    priority: int = 0
+    # time.monotonic_ns() after which the request is dropped from the queue;
+    # set by the worker that queues it
+    deadline_ns: Optional[int] = None
 
-    def age_ms(self) -> float:
+    def age_ms(self, now_ns: Optional[int] = None) -> float:
         """Get request age in milliseconds.
 
+        Args:
+            now_ns: Current time.monotonic_ns(), to share one clock read
+                across a batch (read here if omitted)
+
         Returns:
             Age in milliseconds
         """
-        return (time.time() - self.enqueue_ts) * 1000
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return (now_ns - self.enqueue_ts) / 1_000_000
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary.
@@ -35,11 +71,12 @@ class InferenceRequest:
             "request_id": self.request_id,
             "enqueue_ts": self.enqueue_ts,
             "age_ms": self.age_ms(),
+            "priority": self.priority,
             "metadata": self.metadata,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class InferenceResponse:
     """Inference response with metadata."""
 
@@ -64,9 +101,12 @@ class InferenceResponse:
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelInfo:
-    """Model information."""
+    """Model information.
+
+    Immutable once loaded, so its dictionary form is built only once.
+    """
 
     name: str
     version: Optional[str] = None
@@ -74,18 +114,26 @@ class ModelInfo:
     batch_size: int = 16
     batch_wait_s: float = 0.003
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_dict",
+            {
+                "name": self.name,
+                "version": self.version,
+                "description": self.description,
+                "batch_size": self.batch_size,
+                "batch_wait_s": self.batch_wait_s,
+                "metadata": self.metadata,
+            },
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary.
 
         Returns:
-            Dictionary representation
+            Dictionary representation (shared; do not modify)
         """
-        return {
-            "name": self.name,
-            "version": self.version,
-            "description": self.description,
-            "batch_size": self.batch_size,
-            "batch_wait_s": self.batch_wait_s,
-            "metadata": self.metadata,
-        }
+        return self._dict
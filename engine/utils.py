@@ -1,7 +1,8 @@
 """Enhanced utilities with better error handling."""
 
 import io
-from typing import Tuple
+import logging
+from typing import BinaryIO, Optional, Tuple, Union
 
 from PIL import Image
 
@@ -14,28 +15,77 @@ logger = get_logger(__name__)
 Image.LOAD_TRUNCATED_IMAGES = True
 Image.MAX_IMAGE_PIXELS = None
 
-
-def decode_image(raw_bytes: bytes) -> Image.Image:
-    """Decode image from bytes.
+# Channel counts for common modes; anything else falls back to getbands()
+_MODE_CHANNELS = {
+    "1": 1,
+    "L": 1,
+    "P": 1,
+    "I": 1,
+    "F": 1,
+    "LA": 2,
+    "RGB": 3,
+    "YCbCr": 3,
+    "RGBA": 4,
+    "CMYK": 4,
+}
+
+
+def _channels(image: Image.Image) -> int:
+    """Return the number of channels in an image."""
+    channels = _MODE_CHANNELS.get(image.mode)
+    if channels is None:
+        channels = len(image.getbands())
+    return channels
+
+
+def decode_image(
+    raw: Union[bytes, bytearray, memoryview, BinaryIO],
+    min_size: Optional[int] = None,
+    max_size_mb: Optional[float] = None,
+) -> Image.Image:
+    """Decode image from bytes or a binary file.
 
     Args:
-        raw_bytes: Raw image bytes
+        raw: Encoded image as a bytes-like object, or a binary file object
+            (e.g. a spooled upload) that PIL reads in place
+        min_size: Smallest side length the caller needs. JPEGs larger than
+            this are decoded at a reduced DCT scale (1/2, 1/4 or 1/8) that
+            still keeps both sides at least min_size.
+        max_size_mb: Largest decoded RGB size to accept. Checked against the
+            dimensions in the header, before any pixels are decoded.
 
     Returns:
         PIL Image
 
     Raises:
-        InvalidImageError: If image cannot be decoded
+        InvalidImageError: If image cannot be decoded or is too large
     """
-    if not raw_bytes:
-        raise InvalidImageError("Empty image data")
+    if hasattr(raw, "read"):
+        source = raw
+    else:
+        if not len(raw):
+            raise InvalidImageError("Empty image data")
+        source = io.BytesIO(raw)
 
     try:
-        img = Image.open(io.BytesIO(raw_bytes))
+        img = Image.open(source)
+
+        # Let libjpeg skip the IDCT work for resolution the caller won't use
+        if min_size and img.format == "JPEG":
+            img.draft("RGB", (min_size, min_size))
+
+        # Reject oversized images before allocating their pixels
+        if max_size_mb is not None:
+            width, height = img.size
+            _check_size(width * height * _MODE_CHANNELS["RGB"], max_size_mb)
+
+        # Decode now, while the source is open, so bad data fails here
+        img.load()
 
         # Convert to RGB if needed
         if img.mode != "RGB":
-            logger.debug(f"Converting image from {img.mode} to RGB")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Converting image from {img.mode} to RGB")
             img = img.convert("RGB")
 
         # Validate image dimensions
@@ -43,7 +93,10 @@ def decode_image(raw_bytes: bytes) -> Image.Image:
         if width <= 0 or height <= 0:
             raise InvalidImageError(f"Invalid image dimensions: {width}x{height}")
 
-        logger.debug(f"Image decoded successfully: {width}x{height}, mode={img.mode}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Image decoded successfully: {width}x{height}, mode={img.mode}"
+            )
         return img
 
     except InvalidImageError:
@@ -65,8 +118,11 @@ def validate_image_size(image: Image.Image, max_size_mb: float = 10.0) -> None:
     """
     # Estimate size in bytes (width * height * channels)
     width, height = image.size
-    channels = len(image.getbands())
-    estimated_size = width * height * channels
+    _check_size(width * height * _channels(image), max_size_mb)
+
+
+def _check_size(estimated_size: int, max_size_mb: float) -> None:
+    """Raise InvalidImageError if an estimated image size exceeds the limit."""
     estimated_size_mb = estimated_size / (1024 * 1024)
 
     if estimated_size_mb > max_size_mb:
@@ -90,7 +146,7 @@ def get_image_info(image: Image.Image) -> dict:
         "height": height,
         "mode": image.mode,
         "format": image.format,
-        "channels": len(image.getbands()),
+        "channels": _channels(image),
     }
 
 
@@ -117,5 +173,8 @@ def resize_image(
     new_width = int(width * ratio)
     new_height = int(height * ratio)
 
-    logger.debug(f"Resizing image from {width}x{height} to {new_width}x{new_height}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Resizing image from {width}x{height} to {new_width}x{new_height}"
+        )
     return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
@@ -1,6 +1,18 @@
 
+import numpy as np
 import torch
-from transformers import CLIPModel, CLIPProcessor
+import torch.nn.functional as F
+
+from engine import preprocess
+
+# Batch sizes captured as CUDA graphs; batches are padded up to the next one
+# and larger batches run in chunks of the largest
+GRAPH_BATCH_SIZES = (1, 2, 4, 8, 16)
+
+FLOAT_DTYPES = {"fp32": torch.float32, "fp16": torch.float16, "bf16": torch.bfloat16}
+
+# Precision used unless to_dtype() picks another
+DEFAULT_DTYPE = {"cuda": "fp16", "cpu": "int8"}
 
 
 class ModelImpl:
@@ -10,8 +22,15 @@ class ModelImpl:
     Supports both CPU and GPU inference.
     """
 
+    # Images may be passed as CHW uint8 tensors (e.g. decoded on the GPU)
+    accepts_tensor_images = True
+
     def load(self):
         """Load the CLIP model and processor."""
+        # Imported here: transformers takes seconds to import, and the module
+        # is also loaded just to validate the model interface
+        from transformers import CLIPModel, CLIPProcessor
+
         model_name = "openai/clip-vit-base-patch32"
         self.processor = CLIPProcessor.from_pretrained(model_name)
         self.model = CLIPModel.from_pretrained(model_name)
@@ -19,38 +38,228 @@ class ModelImpl:
         # Use GPU if available, otherwise CPU
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model = self.model.to(self.device).eval()
+
+        # Precision is applied on first use (see to_dtype) so that a
+        # configured dtype can still be chosen from the float32 weights
+        self.precision = None
+        self.dtype = torch.float32
+        self.image_features = self._features
+
+        # Batch size -> (graph, static input, static output), see
+        # capture_cuda_graphs
+        self._graphs = {}
+
+        # Normalization constants for the tensor preprocessing path; the
+        # input size also lets the batch worker decode JPEGs at reduced scale
+        image_processor = self.processor.image_processor
+        self.input_size = image_processor.crop_size["height"]
+        self.image_mean = torch.tensor(image_processor.image_mean, device=self.device)
+        self.image_std = torch.tensor(image_processor.image_std, device=self.device)
+        self.normalize_mean = np.asarray(image_processor.image_mean, dtype=np.float32)
+        self.normalize_std = np.asarray(image_processor.image_std, dtype=np.float32)
         
         print(f"Model loaded on {self.device}")
 
+    def to_dtype(self, dtype):
+        """Set the inference precision.
+
+        By default the image tower runs in fp16 on GPU and as dynamically
+        quantized int8 (weights ahead of time, activations per batch, for
+        VNNI/AVX-512 int8 matmuls) on CPU. On GPU it is also compiled into
+        fused kernels, on its first call. Embeddings are L2-normalized in
+        float32 whatever the precision.
+
+        Args:
+            dtype: "fp32", "fp16", "bf16" or "int8" (CPU only)
+
+        Raises:
+            ValueError: If the dtype is unknown or unsupported on this
+                device, or the weights are already quantized
+        """
+        if dtype == self.precision:
+            return
+        if self.precision == "int8":
+            raise ValueError("int8 weights cannot be converted back; reload the model")
+
+        if dtype == "int8":
+            if self.device == "cuda":
+                raise ValueError("int8 is only supported on CPU")
+            self.dtype = torch.float32
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model.float(), {torch.nn.Linear}, dtype=torch.qint8
+            )
+        elif dtype in FLOAT_DTYPES:
+            self.dtype = FLOAT_DTYPES[dtype]
+            self.model = self.model.to(self.dtype)
+        else:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+
+        self.precision = dtype
+        self.image_features = (
+            torch.compile(self._features) if self.device == "cuda" else self._features
+        )
+        # Graphs captured for other weights are stale
+        self._graphs = {}
+
     def warmup(self):
         """Warmup the model with dummy inputs."""
-        dummy = torch.zeros(1, 3, 224, 224).to(self.device)
-        with torch.no_grad():
-            self.model.get_image_features(dummy)
+        preprocess.warmup()
+        dummy = torch.zeros(1, 3, self.input_size, self.input_size).to(self.device)
+        self._embed(dummy)
+
+    def capture_cuda_graphs(self):
+        """Capture the image tower and L2 normalization as CUDA graphs.
+
+        One graph per size in ``GRAPH_BATCH_SIZES``. Replaying a graph
+        launches the whole forward pass at once instead of kernel by kernel,
+        which dominates small-batch latency. Does nothing on CPU.
+        """
+        if self.device != "cuda":
+            return
+        if self.precision is None:
+            self.to_dtype(DEFAULT_DTYPE[self.device])
+
+        size = self.input_size
+        for batch_size in GRAPH_BATCH_SIZES:
+            static_in = torch.zeros(
+                batch_size, 3, size, size, device=self.device, dtype=self.dtype
+            )
+
+            # Compile and warm up on a side stream before capturing
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream), torch.no_grad():
+                for _ in range(3):
+                    self.image_features(static_in)
+            torch.cuda.current_stream().wait_stream(stream)
+
+            graph = torch.cuda.CUDAGraph()
+            with torch.no_grad(), torch.cuda.graph(graph):
+                static_out = self.image_features(static_in)
+            self._graphs[batch_size] = (graph, static_in, static_out)
+
+    def _features(self, x):
+        """Image tower followed by L2 normalization (in float32)."""
+        e = self.model.get_image_features(x)
+        # transformers >= 5 wraps the projected features in an output
+        e = getattr(e, "pooler_output", e).float()
+        return e / e.norm(dim=-1, keepdim=True)
 
     def batch_size(self):
         """Return optimal batch size."""
-        return 8 if self.device == "cpu" else 16
+        return 32 if self.device == "cpu" else 16
 
     def batch_wait_s(self):
         """Return batch wait time in seconds."""
         return 0.005 if self.device == "cpu" else 0.003
 
+    def _preprocess_tensors(self, images):
+        """Resize, center-crop and normalize CHW uint8 tensors on the device.
+
+        Mirrors CLIPProcessor (shortest-side bicubic resize, center crop,
+        mean/std normalization) without leaving the device.
+        """
+        size = self.input_size
+        crops = []
+        for image in images:
+            x = image.to(self.device).unsqueeze(0).float()
+            height, width = x.shape[-2:]
+            scale = size / min(height, width)
+            new_h, new_w = max(size, round(height * scale)), max(size, round(width * scale))
+            x = F.interpolate(
+                x, size=(new_h, new_w), mode="bicubic", align_corners=False, antialias=True
+            )
+            top, left = (new_h - size) // 2, (new_w - size) // 2
+            crops.append(x[..., top : top + size, left : left + size])
+
+        x = torch.cat(crops).clamp_(0, 255) / 255.0
+        return (x - self.image_mean.view(1, 3, 1, 1)) / self.image_std.view(1, 3, 1, 1)
+
+    def _preprocess_images(self, images):
+        """Resize and center-crop PIL images on the CPU.
+
+        Mirrors CLIPProcessor's geometry. Images are cropped in parallel,
+        each straight into one contiguous uint8 (B, S, S, 3) tensor, pinned
+        when targeting a GPU so ``encode_tensor`` uploads it asynchronously.
+        """
+        size = self.input_size
+        pixels = torch.empty(
+            (len(images), size, size, 3),
+            dtype=torch.uint8,
+            pin_memory=self.device == "cuda",
+        )
+        preprocess.crop_images(images, size, out=pixels.numpy())
+        return pixels
+
+    def _embed(self, x):
+        """Run the image tower and L2-normalize the embeddings.
+
+        Inputs are normalized in float32 and cast to the model dtype here;
+        the L2 normalization runs in float32 again for stability. Once CUDA
+        graphs are captured, batches replay them (padded to the next
+        captured size, larger ones in chunks) instead of launching kernels
+        one by one.
+        """
+        if self.precision is None:
+            self.to_dtype(DEFAULT_DTYPE[self.device])
+
+        if not self._graphs:
+            with torch.no_grad():
+                e = self.image_features(x.to(self.dtype))
+            # One array, not N*D boxed floats; callers take it as is (batch)
+            # or convert it in a single call (service)
+            return e.cpu().numpy()
+
+        largest = GRAPH_BATCH_SIZES[-1]
+        chunks = []
+        for start in range(0, x.shape[0], largest):
+            chunk = x[start : start + largest]
+            n = chunk.shape[0]
+            batch_size = next(b for b in GRAPH_BATCH_SIZES if b >= n)
+            graph, static_in, static_out = self._graphs[batch_size]
+            # Padding rows keep whatever the last replay left there
+            static_in[:n].copy_(chunk)
+            graph.replay()
+            chunks.append(static_out[:n].cpu().numpy())
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    def encode_tensor(self, pixels):
+        """Encode a batch of already resized and cropped images.
+
+        Normalization runs on the GPU when the pixels live there, otherwise
+        as one fused CPU kernel (HWC -> CHW included).
+
+        Args:
+            pixels: uint8 tensor of shape (B, S, S, 3) with S = ``input_size``,
+                on the CPU or the model's device
+
+        Returns:
+            float32 array of normalized embeddings, shape (B, D)
+        """
+        if self.device == "cuda":
+            x = pixels.to(self.device, non_blocking=True).permute(0, 3, 1, 2).float()
+            x = (x / 255.0 - self.image_mean.view(1, 3, 1, 1)) / self.image_std.view(
+                1, 3, 1, 1
+            )
+        else:
+            x = torch.from_numpy(
+                preprocess.normalize_images(
+                    pixels.numpy(), self.normalize_mean, self.normalize_std
+                )
+            )
+        return self._embed(x)
+
     def encode(self, batch):
         """Encode a batch of images into embeddings.
         
         Args:
-            batch: List of dicts with 'image' and optional 'text'
+            batch: List of dicts with 'image' (PIL Image or CHW uint8 tensor)
+                and optional 'text'
             
         Returns:
-            List of normalized embeddings
+            float32 array of normalized embeddings, shape (B, D)
         """
         images = [b["image"] for b in batch]
-        inputs = self.processor(images=images, return_tensors="pt")
-        x = inputs["pixel_values"].to(self.device)
-        
-        with torch.no_grad():
-            e = self.model.get_image_features(x)
-            e = e / e.norm(dim=-1, keepdim=True)
-        
-        return e.cpu().tolist()
+        if all(torch.is_tensor(image) for image in images):
+            return self._embed(self._preprocess_tensors(images))
+        return self.encode_tensor(self._preprocess_images(images))
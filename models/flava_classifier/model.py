@@ -1,9 +1,10 @@
 
 import torch, torch.nn as nn
-from transformers import FlavaModel, FlavaProcessor
 
 class ModelImpl:
     def load(self):
+        # transformers is slow to import; only needed once weights load
+        from transformers import FlavaModel, FlavaProcessor
         self.num_classes = 10
         self.processor = FlavaProcessor.from_pretrained("facebook/flava-full")
         base = FlavaModel.from_pretrained("facebook/flava-full")
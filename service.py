@@ -2,19 +2,25 @@
 
 import argparse
 import asyncio
-import os
+import logging
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Optional
+from queue import Empty, SimpleQueue
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+import orjson
 import ray
 import torch
 import uvicorn
-from fastapi import FastAPI, File, HTTPException, Response, UploadFile
+from fastapi import FastAPI, File, Header, HTTPException, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from ray import serve
 
+from engine import preprocess
+from engine.batching import AdaptiveBatchPolicy
 from engine.config import Config, get_config, load_config
 from engine.exceptions import (
     InvalidImageError,
@@ -27,7 +33,7 @@ from engine.logging import get_logger, setup_logging
 from engine.metrics import MetricsCollector, get_metrics
 from engine.queue import RequestQueue
 from engine.types import InferenceRequest, InferenceResponse
-from engine.utils import decode_image, get_image_info, validate_image_size
+from engine.utils import decode_image
 
 
 # Parse arguments
@@ -51,6 +57,12 @@ else:
 setup_logging(config.logging)
 logger = get_logger(__name__)
 
+# How often the API refreshes its cached copy of the worker's admission decision
+ADMISSION_REFRESH_S = 0.5
+
+# How often the worker fails requests that have passed their deadline
+EXPIRE_INTERVAL_S = 0.1
+
 
 @serve.deployment(
     ray_actor_options={
@@ -75,9 +87,24 @@ class ModelWorker:
         self.queue = None
         self.batch_size = config.models.default_batch_size
         self.batch_wait = config.models.default_batch_wait_s
-        self._scheduler_task = None
+        self.input_size = None
+        self._encode_pixels = False
+        self._pixel_pool = SimpleQueue()
+        self._copy_stream = None
+        self._policy = None
+        self._prepared = None
+        self._batcher_task = None
+        self._executor_task = None
+        self._expire_task = None
+        # The model runs on one dedicated thread: off the event loop, in
+        # batch order, and never concurrently with itself
+        self._encode_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="encode"
+        )
 
         logger.info(f"Initializing ModelWorker for {model_directory}")
+        # Ray installs uvloop in its workers unless RAY_USE_UVLOOP=0
+        logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
 
         # Load model
         try:
@@ -100,6 +127,14 @@ class ModelWorker:
             self.model.load()
             logger.info("Model weights loaded")
 
+            # Apply the configured precision
+            if config.models.dtype != "auto":
+                if hasattr(self.model, "to_dtype"):
+                    self.model.to_dtype(config.models.dtype)
+                    logger.info(f"Model precision set to {config.models.dtype}")
+                else:
+                    logger.warning("Model has no to_dtype(); ignoring models.dtype")
+
             # Warmup
             if config.models.warmup_enabled:
                 start_time = time.time()
@@ -108,6 +143,29 @@ class ModelWorker:
                 self.metrics.record_model_warmup(warmup_duration)
                 logger.info(f"Model warmed up in {warmup_duration:.2f}s")
 
+            # Models may capture their forward pass as CUDA graphs
+            if (
+                config.models.cuda_graph_enabled
+                and torch.cuda.is_available()
+                and hasattr(self.model, "capture_cuda_graphs")
+            ):
+                start_time = time.time()
+                self.model.capture_cuda_graphs()
+                logger.info(f"CUDA graphs captured in {time.time() - start_time:.2f}s")
+
+            # Models that take resized, center-cropped pixels get one uint8
+            # tensor per batch; others get decoded images. Models may also
+            # declare the smallest side they need, for reduced-scale JPEG
+            # decoding
+            self.input_size = getattr(self.model, "input_size", None)
+            self._encode_pixels = bool(self.input_size) and hasattr(
+                self.model, "encode_tensor"
+            )
+            # Crops go into reusable (pinned) buffers and, on GPU, are
+            # uploaded on a side stream while the previous batch computes
+            if self._encode_pixels and torch.cuda.is_available():
+                self._copy_stream = torch.cuda.Stream()
+
             # Get batch configuration
             self.batch_size = self.model.batch_size()
             self.batch_wait = self.model.batch_wait_s()
@@ -123,98 +181,363 @@ class ModelWorker:
         # Initialize queue
         self.queue = RequestQueue(maxsize=config.server.max_queue_size)
 
-        # Start scheduler
-        self._scheduler_task = asyncio.create_task(self._scheduler())
+        # Start scheduler: one task forms batches while the other runs the
+        # model, with at most one prepared batch waiting between them
+        self._policy = AdaptiveBatchPolicy(self.batch_size, self.batch_wait)
+        self._prepared = asyncio.Queue(maxsize=1)
+        self._batcher_task = asyncio.create_task(self._batcher())
+        self._executor_task = asyncio.create_task(self._executor())
+        self._expire_task = asyncio.create_task(self._expire_requests())
         logger.info("ModelWorker initialized successfully")
 
-    async def _scheduler(self) -> None:
-        """Background scheduler for batch processing."""
-        logger.info("Scheduler started")
+    async def _expire_requests(self) -> None:
+        """Periodically fail requests that have passed their deadline.
 
+        One sweep replaces a timer per request; requests being processed
+        are covered too.
+        """
+        queue = self.queue
         while True:
+            await asyncio.sleep(EXPIRE_INTERVAL_S)
             try:
-                batch_start = time.time()
-                batch = await self.queue.get_batch(self.batch_size, self.batch_wait)
+                queue.expire()
+            except Exception as e:
+                logger.error(f"Request expiry failed: {e}", exc_info=True)
 
+    async def _batcher(self) -> None:
+        """Form batches from the request queue.
+
+        Starts a batch as soon as a request arrives, then tops it up for at
+        most the policy's wait, decodes it and hands it to the executor. The
+        next batch is formed while the executor runs the model on this one.
+        """
+        logger.info("Batcher started")
+
+        policy = self._policy
+        queue = self.queue
+        prepared = self._prepared
+        metrics = self.metrics
+        loop = asyncio.get_running_loop()
+        now = time.perf_counter
+        step = 0
+
+        while True:
+            try:
+                first = await queue.get()
+                batch_start = now()
+                batch = await queue.extend_batch([first], policy.batch_size, policy.wait_s)
+                batch_wait_time = now() - batch_start
+
+                # Update queue metrics
+                depth = queue.depth()
+                metrics.update_queue_depth(depth)
+                metrics.record_batch(len(batch), batch_wait_time)
+
+                step += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Batch {step} formed: size={len(batch)}, "
+                        f"limit={policy.batch_size}, "
+                        f"wait_time={batch_wait_time*1000:.2f}ms"
+                    )
+
+                # Decode the whole batch off the event loop
+                try:
+                    batch, inputs, failed = await loop.run_in_executor(
+                        None, self._prepare, batch
+                    )
+                except Exception as e:
+                    logger.error(f"Batch {step} preprocessing failed: {e}", exc_info=True)
+                    failed = [(req, e) for req in batch]
+                    batch = []
+                for req, error in failed:
+                    if not req.future.done():
+                        req.future.set_exception(error)
+                        metrics.record_error(
+                            "invalid_image"
+                            if isinstance(error, InvalidImageError)
+                            else "processing_error"
+                        )
                 if not batch:
                     continue
 
-                batch_wait_time = time.time() - batch_start
+                await prepared.put((step, batch, inputs, depth))
 
-                # Update queue metrics
-                self.metrics.update_queue_depth(self.queue.depth())
-                self.metrics.record_batch(len(batch), batch_wait_time)
+            except Exception as e:
+                logger.error(f"Batcher error: {e}", exc_info=True)
+                await asyncio.sleep(0.1)
 
-                logger.debug(
-                    f"Processing batch: size={len(batch)}, "
-                    f"wait_time={batch_wait_time*1000:.2f}ms"
+    def _prepare(
+        self, batch: List[InferenceRequest]
+    ) -> Tuple[List[InferenceRequest], Any, List[Tuple[InferenceRequest, Exception]]]:
+        """Decode a batch of uploads into model input.
+
+        Images are decoded in parallel on the preprocessing pool and, for
+        models with ``encode_tensor``, staged as one uint8 tensor (see
+        ``_stage_pixels``).
+
+        Args:
+            batch: Requests carrying raw image bytes
+
+        Returns:
+            Tuple of (requests that decoded, model input for them,
+            (request, error) pairs for those that did not)
+        """
+        max_size_mb = self.config.security.max_upload_size_mb
+        min_size = self.input_size
+        raw = [req.payload["image_bytes"] for req in batch]
+        errors: Dict[int, Exception] = {}
+
+        def decode(i: int) -> Any:
+            try:
+                return decode_image(raw[i], min_size=min_size, max_size_mb=max_size_mb)
+            except InvalidImageError as e:
+                errors[i] = e
+                return None
+
+        images = preprocess.parallel_map(decode, range(len(batch)))
+
+        # Usually every image decodes and the batch is used as is
+        requests, failed = batch, []
+        if errors:
+            failed = [(batch[i], e) for i, e in errors.items()]
+            requests = [req for i, req in enumerate(batch) if i not in errors]
+            images = [image for i, image in enumerate(images) if i not in errors]
+
+        if not requests:
+            return requests, None, failed
+        if self._encode_pixels:
+            inputs = self._stage_pixels(images)
+        else:
+            inputs = [
+                {"image": image, "text": req.payload.get("text")}
+                for req, image in zip(requests, images)
+            ]
+        return requests, inputs, failed
+
+    def _stage_pixels(
+        self, images: List[Any]
+    ) -> Tuple[torch.Tensor, Optional[torch.cuda.Event], torch.Tensor]:
+        """Crop images into a pooled buffer and start uploading it.
+
+        Args:
+            images: Decoded PIL images
+
+        Returns:
+            Tuple of (pixels for encode_tensor, event marking the end of the
+            upload or None on CPU, buffer to return to the pool)
+        """
+        n = len(images)
+        try:
+            buffer = self._pixel_pool.get_nowait()
+        except Empty:
+            buffer = None
+        if buffer is None or len(buffer) < n:
+            if buffer is not None:
+                self._pixel_pool.put(buffer)
+            size = self.input_size
+            buffer = torch.empty(
+                (max(n, self.batch_size), size, size, 3),
+                dtype=torch.uint8,
+                pin_memory=self._copy_stream is not None,
+            )
+
+        rows = buffer[:n]
+        preprocess.crop_images(images, self.input_size, out=rows.numpy())
+        if self._copy_stream is None:
+            return rows, None, buffer
+
+        with torch.cuda.stream(self._copy_stream):
+            pixels = rows.to("cuda", non_blocking=True)
+            ready = torch.cuda.Event()
+            ready.record(self._copy_stream)
+        return pixels, ready, buffer
+
+    def _encode_staged(
+        self, staged: Tuple[torch.Tensor, Optional[torch.cuda.Event], torch.Tensor]
+    ) -> Any:
+        """Run ``encode_tensor`` on staged pixels (on the encode thread).
+
+        Args:
+            staged: Result of ``_stage_pixels``
+
+        Returns:
+            Model outputs
+        """
+        pixels, ready, buffer = staged
+        try:
+            if ready is not None:
+                # Compute waits for the upload; the allocator must not reuse
+                # the pixels (made on the copy stream) before compute is done
+                stream = torch.cuda.current_stream()
+                stream.wait_event(ready)
+                pixels.record_stream(stream)
+            return self.model.encode_tensor(pixels)
+        finally:
+            # Outputs are back on the host, so the upload has finished too
+            self._pixel_pool.put(buffer)
+
+    async def _executor(self) -> None:
+        """Run the model on prepared batches.
+
+        The model runs on the encode thread, so the event loop keeps
+        serving requests and forming the next batch meanwhile. Results are
+        handed to ``_dispatch`` on the next loop iteration so the executor
+        goes straight back to waiting for the next batch.
+        """
+        logger.info("Executor started")
+
+        policy = self._policy
+        prepared = self._prepared
+        metrics = self.metrics
+        encode = self._encode_staged if self._encode_pixels else self.model.encode
+        loop = asyncio.get_running_loop()
+        now = time.perf_counter
+
+        while True:
+            step, batch, inputs, depth = await prepared.get()
+
+            process_start = now()
+            try:
+                # May be an (N, D) array; rows stay arrays until the endpoint
+                # picks JSON or binary encoding
+                outputs = await loop.run_in_executor(
+                    self._encode_executor, encode, inputs
                 )
+            except Exception as e:
+                logger.error(f"Batch {step} processing failed: {e}", exc_info=True)
 
-                # Process batch
-                process_start = time.time()
-                try:
-                    outputs = self.model.encode([r.payload for r in batch])
-                    process_duration = time.time() - process_start
-
-                    # Set results
-                    for req, output in zip(batch, outputs):
-                        processing_time = (time.time() - req.enqueue_ts) * 1000
-                        response = InferenceResponse(
-                            output=output,
-                            request_id=req.request_id,
-                            processing_time_ms=processing_time,
-                            batch_size=len(batch),
-                        )
-                        req.future.set_result(response)
+                # Set error for all requests in batch
+                for req in batch:
+                    if not req.future.done():
+                        req.future.set_exception(e)
+                        metrics.record_error("processing_error")
+                continue
+
+            process_duration = now() - process_start
+            policy.update(len(batch), depth, process_duration)
+            loop.call_soon(self._dispatch, step, batch, outputs, process_duration)
 
-                        # Record metrics
-                        self.metrics.record_request("success", processing_time / 1000)
+    def _dispatch(
+        self, step: int, batch: List[InferenceRequest], outputs: Any, duration: float
+    ) -> None:
+        """Resolve the futures of a processed batch and record metrics.
 
-                    logger.info(
-                        f"Batch processed: size={len(batch)}, "
-                        f"duration={process_duration*1000:.2f}ms"
+        Args:
+            step: Batch number, for logging
+            batch: Requests in the batch
+            outputs: Model outputs, one per request
+            duration: Model processing time in seconds
+        """
+        try:
+            size = len(batch)
+            durations = []
+            # One clock read for the whole batch
+            now_ns = time.monotonic_ns()
+            for req, output in zip(batch, outputs):
+                # Requests that timed out meanwhile are already answered
+                if req.future.done():
+                    continue
+                processing_time = req.age_ms(now_ns)
+                req.future.set_result(
+                    InferenceResponse(
+                        output=output,
+                        request_id=req.request_id,
+                        processing_time_ms=processing_time,
+                        batch_size=size,
                     )
+                )
+                durations.append(processing_time / 1000)
 
-                except Exception as e:
-                    logger.error(f"Batch processing failed: {e}", exc_info=True)
+            self.metrics.record_requests("success", durations)
 
-                    # Set error for all requests in batch
-                    for req in batch:
-                        if not req.future.done():
-                            req.future.set_exception(e)
-                            self.metrics.record_error("processing_error")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Batch {step} processed: size={size}, "
+                    f"duration={duration*1000:.2f}ms"
+                )
+        except Exception as e:
+            logger.error(f"Batch {step} dispatch failed: {e}", exc_info=True)
+            for req in batch:
+                if not req.future.done():
+                    req.future.set_exception(e)
+
+    def shutdown(self) -> None:
+        """Stop the worker and release its resources.
+
+        Cancels the scheduler tasks and the futures of every request still
+        queued, prepared or being processed, stops the encode thread and
+        frees the staging buffers, the model and cached GPU memory. Safe to
+        call more than once.
+        """
+        for task in (self._batcher_task, self._executor_task, self._expire_task):
+            if task is not None:
+                task.cancel()
+        self._batcher_task = self._executor_task = self._expire_task = None
+
+        pending = self.queue.drain() if self.queue is not None else []
+        while self._prepared is not None and not self._prepared.empty():
+            pending.extend(self._prepared.get_nowait()[1])
+        # Prepared batches are usually also still tracked by the queue;
+        # cancel() only counts each future once
+        cancelled = sum(req.future.cancel() for req in pending)
+        if cancelled:
+            logger.warning(f"Cancelled {cancelled} requests on shutdown")
+
+        self._encode_executor.shutdown(wait=False, cancel_futures=True)
+        self._pixel_pool = SimpleQueue()
+        self._copy_stream = None
+        self.model = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
 
-            except Exception as e:
-                logger.error(f"Scheduler error: {e}", exc_info=True)
-                await asyncio.sleep(0.1)
+    def __del__(self):
+        """Shut down on replica teardown (Ray Serve calls this explicitly)."""
+        self.shutdown()
 
-    async def infer(self, request: InferenceRequest) -> InferenceResponse:
+    async def infer(self, payload: Dict[str, Any], priority: int = 0) -> InferenceResponse:
         """Process inference request.
 
+        The request and its future are created here, in the worker's event
+        loop, so only the payload crosses the actor boundary.
+
         Args:
-            request: Inference request
+            payload: Raw ``image_bytes`` and optional ``text``
+            priority: Request priority (higher is batched first)
 
         Returns:
             Inference response
 
         Raises:
             QueueFullError: If queue is full
+            InvalidImageError: If the image cannot be decoded or is too large
             TimeoutError: If request times out
         """
+        request = InferenceRequest(
+            payload=payload,
+            future=asyncio.get_running_loop().create_future(),
+            priority=priority,
+        )
+        timeout_s = self.config.server.request_timeout_s
         try:
-            await self.queue.put(request)
+            if not self.should_admit():
+                raise QueueFullError(
+                    "Expected queue wait exceeds the request timeout",
+                    queue_depth=self.queue.depth(),
+                )
 
-            # Wait for result with timeout
-            result = await asyncio.wait_for(
-                request.future,
-                timeout=self.config.server.request_timeout_s,
-            )
+            # The queue fails the request once the deadline has passed,
+            # whether it is still queued or being processed
+            request.deadline_ns = time.monotonic_ns() + int(timeout_s * 1e9)
+            await self.queue.put(request)
 
-            return result
+            return await request.future
 
         except QueueFullError:
             self.metrics.record_queue_rejection()
             raise
+        except InvalidImageError:
+            raise
         except asyncio.TimeoutError:
             logger.error(f"Request timeout: {request.request_id}")
             self.metrics.record_error("timeout")
@@ -224,6 +547,25 @@ class ModelWorker:
             self.metrics.record_error("unknown")
             raise
 
+    def expected_wait_s(self) -> float:
+        """Estimate how long a new request would wait in the queue.
+
+        Returns:
+            Expected wait in seconds, from the observed throughput
+        """
+        return self._policy.expected_wait_s(self.queue.depth())
+
+    def should_admit(self) -> bool:
+        """Check whether a new request can be served before it times out.
+
+        Returns:
+            False if the expected queue wait exceeds
+            ``server.admission_wait_fraction`` of the request timeout
+        """
+        server = self.config.server
+        limit_s = server.admission_wait_fraction * server.request_timeout_s
+        return not limit_s or self.expected_wait_s() <= limit_s
+
     def get_model_info(self) -> dict:
         """Get model information.
 
@@ -242,6 +584,23 @@ class ModelWorker:
 
 
 # Create FastAPI app
+class OrjsonResponse(Response):
+    """JSON response encoded by orjson.
+
+    Numpy arrays (other than float16) are written directly, without going
+    through Python lists. Replaces FastAPI's ORJSONResponse, which is
+    deprecated and warns on every response.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Encode the content as JSON."""
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
@@ -255,6 +614,8 @@ app = FastAPI(
     description="Production-grade inference engine for embedding models",
     version=config.service.version,
     lifespan=lifespan,
+    # Responses (embedding float lists in particular) are encoded by orjson
+    default_response_class=OrjsonResponse,
 )
 
 # Add CORS middleware
@@ -281,74 +642,87 @@ class API:
         """
         self.worker = worker
         self.config = config
+        # The worker's admission decision, refreshed in the background at
+        # most every ADMISSION_REFRESH_S rather than asked for per request
+        self._admit = True
+        self._admit_ts = 0.0
+        self._admit_task: Optional[asyncio.Task] = None
         logger.info("API initialized")
 
-    @app.post("/infer")
-    async def infer(
-        self,
-        image: UploadFile = File(...),
-        text: Optional[str] = None,
-    ) -> dict:
-        """Perform inference on image and optional text.
+    async def _refresh_admission(self) -> None:
+        """Fetch the worker's admission decision."""
+        try:
+            self._admit = await self.worker.should_admit.remote()
+        except Exception as e:
+            logger.warning(f"Failed to refresh admission: {e}")
+
+    def _check_admission(self) -> None:
+        """Reject the request early if it would time out in the queue.
+
+        Uses the worker's cached ``should_admit`` decision and starts a
+        refresh when it is stale.
+
+        Raises:
+            QueueFullError: If the worker is turning requests away
+        """
+        now = time.monotonic()
+        if now - self._admit_ts >= ADMISSION_REFRESH_S and (
+            self._admit_task is None or self._admit_task.done()
+        ):
+            self._admit_ts = now
+            self._admit_task = asyncio.create_task(self._refresh_admission())
+
+        if not self._admit:
+            raise QueueFullError("Expected queue wait exceeds the request timeout")
+
+    async def _infer(
+        self, image: UploadFile, text: Optional[str], priority: Optional[int] = None
+    ) -> InferenceResponse:
+        """Validate an upload and run it through the model worker.
 
         Args:
             image: Image file
             text: Optional text input
+            priority: Optional request priority (higher is batched first)
 
         Returns:
-            Inference result
+            Inference response
 
         Raises:
             HTTPException: On validation or processing errors
         """
-        request_start = time.time()
-
         try:
+            # Turn away requests that would time out before reading them
+            self._check_admission()
+
             # Validate file
             if not image.content_type or not image.content_type.startswith("image/"):
                 raise InvalidRequestError(f"Invalid content type: {image.content_type}")
 
-            # Check file size
-            content = await image.read()
-            size_mb = len(content) / (1024 * 1024)
+            # Check file size before reading; Starlette records it while
+            # parsing the form
+            size_bytes = image.size
+            size_mb = size_bytes / (1024 * 1024)
             if size_mb > self.config.security.max_upload_size_mb:
                 raise InvalidRequestError(
                     f"File too large: {size_mb:.2f}MB "
                     f"(max: {self.config.security.max_upload_size_mb}MB)"
                 )
 
-            # Decode image
-            img = decode_image(content)
+            if size_bytes == 0:
+                raise InvalidImageError("Empty image data")
 
-            # Validate image
-            validate_image_size(img, self.config.security.max_upload_size_mb)
+            # Read off the loop: large uploads are spooled to disk
+            content = await image.read()
 
-            # Create payload
+            # Create payload; the model worker decodes whole batches at once
             payload = {
-                "image": img,
+                "image_bytes": content,
                 "text": text,
             }
 
-            # Create request
-            future = asyncio.get_event_loop().create_future()
-            inference_req = InferenceRequest(
-                payload=payload,
-                future=future,
-                metadata={"image_info": get_image_info(img)},
-            )
-
-            # Process request
-            response = await self.worker.infer.remote(inference_req)
-
-            duration = time.time() - request_start
-
-            return {
-                "output": response.output,
-                "request_id": response.request_id,
-                "processing_time_ms": response.processing_time_ms,
-                "batch_size": response.batch_size,
-                "total_time_ms": duration * 1000,
-            }
+            # Process request; only the bytes and text are sent to the worker
+            return await self.worker.infer.remote(payload, priority or 0)
 
         except InvalidImageError as e:
             logger.warning(f"Invalid image: {e}")
@@ -363,6 +737,98 @@ class API:
             logger.error(f"Inference error: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Internal server error")
 
+    @app.post("/infer")
+    async def infer(
+        self,
+        image: UploadFile = File(...),
+        text: Optional[str] = None,
+        x_priority: Optional[int] = Header(None),
+    ) -> OrjsonResponse:
+        """Perform inference on image and optional text.
+
+        Args:
+            image: Image file
+            text: Optional text input
+            x_priority: Optional ``X-Priority`` header; higher priorities are
+                batched first
+
+        Returns:
+            Inference result
+
+        Raises:
+            HTTPException: On validation or processing errors
+        """
+        request_start = time.perf_counter()
+        response = await self._infer(image, text, x_priority)
+        duration = time.perf_counter() - request_start
+
+        # orjson writes numeric arrays directly; float16 (and anything else
+        # it cannot) goes through Python lists
+        output = response.output
+        if isinstance(output, np.ndarray):
+            if output.dtype.kind in "fiu" and output.dtype != np.float16:
+                output = np.ascontiguousarray(output)
+            else:
+                output = output.tolist()
+
+        # Returned as a response so FastAPI skips its own serialization pass
+        return OrjsonResponse(
+            {
+                "output": output,
+                "request_id": response.request_id,
+                "processing_time_ms": response.processing_time_ms,
+                "batch_size": response.batch_size,
+                "total_time_ms": duration * 1000,
+            }
+        )
+
+    @app.post("/encode_bin")
+    async def encode_bin(
+        self,
+        image: UploadFile = File(...),
+        text: Optional[str] = None,
+        x_priority: Optional[int] = Header(None),
+    ) -> Response:
+        """Perform inference and return the embedding as raw float16 bytes.
+
+        The body is the little-endian float16 buffer; clients decode it with
+        ``np.frombuffer(body, "<f2").reshape(shape)`` using the
+        ``X-Embedding-Shape`` header.
+
+        Args:
+            image: Image file
+            text: Optional text input
+            x_priority: Optional ``X-Priority`` header; higher priorities are
+                batched first
+
+        Returns:
+            Binary embedding response
+
+        Raises:
+            HTTPException: On validation or processing errors, or if the
+                model output is not numeric
+        """
+        response = await self._infer(image, text, x_priority)
+
+        try:
+            embedding = np.asarray(response.output, dtype="<f2")
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=422, detail="Model output is not a numeric embedding"
+            )
+        if embedding.ndim == 1:
+            embedding = embedding[None, :]
+
+        return Response(
+            content=embedding.tobytes(),
+            media_type="application/octet-stream",
+            headers={
+                "X-Embedding-Shape": ",".join(map(str, embedding.shape)),
+                "X-Embedding-Dtype": "float16",
+                "X-Request-ID": response.request_id,
+            },
+        )
+
     @app.get("/health")
     async def health() -> dict:
         """Health check endpoint.
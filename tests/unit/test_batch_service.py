@@ -0,0 +1,270 @@
+"""Unit tests for batch service output helpers."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("ray")
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import batch_service
+from batch_service import (
+    UnifiedDataLoader,
+    UnifiedOutputWriter,
+    embedding_columns,
+    output_schema,
+    quantize_embeddings,
+)
+
+SCHEMA = output_schema("float32", 2)
+
+
+def result_table(urls, **metadata):
+    """Create a table of result columns plus metadata columns.
+
+    Args:
+        urls: One url per row
+        **metadata: Metadata columns, named without the ``meta_`` prefix
+
+    Returns:
+        Arrow table
+    """
+    n = len(urls)
+    columns = {
+        "url": urls,
+        "key": [str(i) for i in range(n)],
+        "caption": [""] * n,
+        "embedding": pa.FixedSizeListArray.from_arrays(
+            pa.array(np.zeros(2 * n, dtype=np.float32)), 2
+        ),
+    }
+    columns.update({f"meta_{name}": column for name, column in metadata.items()})
+    return pa.table(columns)
+
+
+def batch_result(embeddings, embedding_dtype="float32"):
+    """Create a worker result for the given embeddings.
+
+    Args:
+        embeddings: (N, D) float array
+        embedding_dtype: Storage type
+
+    Returns:
+        Result dict as returned by ``BatchInferenceWorker.process_batch``
+    """
+    rows = pa.table({"url": [f"u{i}" for i in range(len(embeddings))]})
+    return {"rows": rows, **quantize_embeddings(embeddings, embedding_dtype)}
+
+
+@pytest.fixture
+def parquet_writer(tmp_path):
+    """Open an embeddings stream writer under a temporary directory."""
+    writer = UnifiedOutputWriter(str(tmp_path)).open_parquet("embeddings.parquet", SCHEMA)
+    yield writer
+    writer.close()
+
+
+def read_output(writer):
+    """Close a stream writer and read back its file."""
+    writer.close()
+    return pq.ParquetFile(writer.output_writer.uri(writer.filename))
+
+
+class TestQuantizeEmbeddings:
+    """Tests for quantize_embeddings function."""
+
+    @pytest.mark.parametrize("embedding_dtype", ["float32", "float16"])
+    def test_float_storage(self, embedding_dtype):
+        """Test that float storage types only change the dtype."""
+        embeddings = np.array([[0.5, -0.25], [1.0, 0.0]], dtype=np.float32)
+
+        columns = quantize_embeddings(embeddings, embedding_dtype)
+
+        assert list(columns) == ["embedding"]
+        assert columns["embedding"].dtype == np.dtype(embedding_dtype)
+        np.testing.assert_array_equal(columns["embedding"], embeddings)
+
+    def test_int8_round_trip(self):
+        """Test that int8 values times their scale recover the embedding."""
+        embeddings = np.array([[0.5, -0.25], [0.0, 0.0]], dtype=np.float32)
+
+        columns = quantize_embeddings(embeddings, "int8")
+
+        assert columns["embedding"].dtype == np.int8
+        assert columns["embedding"][0].tolist() == [127, -64]
+        assert columns["embedding_scale"].tolist() == pytest.approx([0.5 / 127, 1.0])
+        np.testing.assert_allclose(
+            columns["embedding"] * columns["embedding_scale"][:, None],
+            embeddings,
+            atol=0.5 / 127,
+        )
+
+    def test_int8_empty(self):
+        """Test that an empty batch quantizes to empty columns."""
+        columns = quantize_embeddings(np.empty((0, 4), dtype=np.float32), "int8")
+
+        assert columns["embedding"].shape == (0, 4)
+        assert columns["embedding_scale"].shape == (0,)
+
+    def test_unknown_dtype(self):
+        """Test that an unknown storage type is rejected."""
+        with pytest.raises(ValueError, match="Unsupported embedding dtype"):
+            quantize_embeddings(np.zeros((1, 2), dtype=np.float32), "int4")
+
+
+class TestEmbeddingColumns:
+    """Tests for embedding_columns function."""
+
+    def test_fixed_length(self):
+        """Test that equal-length embeddings become one fixed-size list column."""
+        results = [
+            batch_result(np.ones((2, 3), dtype=np.float32)),
+            batch_result(np.empty((0, 3), dtype=np.float32)),
+            batch_result(np.full((1, 3), 2.0, dtype=np.float32)),
+        ]
+
+        columns = embedding_columns(results)
+
+        assert columns["embedding"].type == pa.list_(pa.float32(), 3)
+        assert columns["embedding"].to_pylist() == [[1.0] * 3, [1.0] * 3, [2.0] * 3]
+
+    def test_variable_length(self):
+        """Test that embeddings of different lengths fall back to a list column."""
+        results = [
+            batch_result(np.ones((1, 2), dtype=np.float32)),
+            batch_result(np.ones((1, 3), dtype=np.float32)),
+        ]
+
+        columns = embedding_columns(results)
+
+        assert columns["embedding"].type == pa.list_(pa.float32())
+        assert [len(e) for e in columns["embedding"].to_pylist()] == [2, 3]
+
+    def test_int8_scale(self):
+        """Test that int8 results carry their per-vector scales."""
+        results = [
+            batch_result(np.array([[1.0, 0.0]], dtype=np.float32), "int8"),
+            batch_result(np.array([[0.0, 2.0]], dtype=np.float32), "int8"),
+        ]
+
+        columns = embedding_columns(results, "int8")
+
+        assert columns["embedding"].type == pa.list_(pa.int8(), 2)
+        assert columns["embedding_scale"].to_pylist() == pytest.approx([1 / 127, 2 / 127])
+
+    def test_empty(self):
+        """Test that no results give empty columns of the storage type."""
+        columns = embedding_columns([], "int8")
+
+        assert columns["embedding"].type == pa.list_(pa.int8())
+        assert len(columns["embedding"]) == 0
+        assert len(columns["embedding_scale"]) == 0
+
+
+class TestParquetStreamWriter:
+    """Tests for ParquetStreamWriter."""
+
+    def test_row_group_per_table(self, parquet_writer):
+        """Test that every written table is flushed as its own row group."""
+        parquet_writer.write_table(result_table(["a", "b"], width=[1, 2]))
+        parquet_writer.write_table(result_table(["c"], width=[3]))
+
+        output = read_output(parquet_writer)
+
+        assert parquet_writer.num_rows == 3
+        assert output.metadata.num_row_groups == 2
+        assert [output.metadata.row_group(i).num_rows for i in range(2)] == [2, 1]
+        assert output.schema_arrow.field("embedding").type == pa.list_(pa.float32(), 2)
+
+    def test_null_column_promoted(self, parquet_writer):
+        """Test that an all-null metadata column takes the type seen later."""
+        parquet_writer.write_table(result_table(["a"], tag=pa.nulls(1)))
+        parquet_writer.write_table(result_table(["b"], tag=["x"]))
+
+        table = read_output(parquet_writer).read()
+
+        assert table.schema.field("meta_tag").type == pa.string()
+        assert table.column("meta_tag").to_pylist() == [None, "x"]
+
+    def test_metadata_union_while_buffered(self, parquet_writer):
+        """Test that metadata columns seen before the file opens are all kept."""
+        parquet_writer.write_table(result_table(["a"], tag=pa.nulls(1)))
+        parquet_writer.write_table(result_table(["b"], tag=["x"], width=[7]))
+
+        table = read_output(parquet_writer).read()
+
+        assert table.column("meta_width").to_pylist() == [None, 7]
+
+    def test_align_fills_and_casts(self, parquet_writer):
+        """Test that later tables are cast and missing columns filled with nulls."""
+        parquet_writer.write_table(result_table(["a"], width=pa.array([1], pa.int64())))
+        table = result_table(["b"], width=pa.array([2], pa.int32()))
+        parquet_writer.write_table(table.drop_columns(["caption"]))
+
+        table = read_output(parquet_writer).read()
+
+        assert table.schema == SCHEMA.append(pa.field("meta_width", pa.int64()))
+        assert table.column("caption").to_pylist() == ["", None]
+        assert table.column("meta_width").to_pylist() == [1, 2]
+
+    def test_unexpected_column_raises(self, parquet_writer):
+        """Test that a column outside the output schema is rejected."""
+        table = result_table(["a"]).append_column("score", pa.array([1.0]))
+
+        with pytest.raises(ValueError, match="not in output schema"):
+            parquet_writer.write_table(table)
+
+    def test_new_metadata_after_open_raises(self, parquet_writer):
+        """Test that a metadata column first seen after opening is not dropped."""
+        parquet_writer.write_table(result_table(["a"], width=[1]))
+
+        with pytest.raises(ValueError, match="meta_height"):
+            parquet_writer.write_table(result_table(["b"], width=[2], height=[3]))
+
+    def test_null_column_after_buffer_limit(self, parquet_writer, monkeypatch):
+        """Test that values for a column stored as null raise once the file is open."""
+        monkeypatch.setattr(batch_service, "OUTPUT_SCHEMA_BUFFER_ROWS", 2)
+        parquet_writer.write_table(result_table(["a", "b"], tag=pa.nulls(2)))
+        parquet_writer.write_table(result_table(["c"], tag=pa.nulls(1)))
+
+        with pytest.raises(ValueError, match="meta_tag"):
+            parquet_writer.write_table(result_table(["d"], tag=["x"]))
+
+    def test_close_writes_buffered_tables(self, parquet_writer):
+        """Test that tables still buffered when closing are written."""
+        parquet_writer.write_table(result_table(["a"], tag=pa.nulls(1)))
+
+        table = read_output(parquet_writer).read()
+
+        assert table.num_rows == 1
+        assert table.schema.field("meta_tag").type == pa.null()
+
+
+class TestUnifiedDataLoader:
+    """Tests for UnifiedDataLoader."""
+
+    def test_reads_every_row_group(self, tmp_path):
+        """Test that rows after the prefetched first row group are all read."""
+        table = pa.table({"url": [f"u{i}" for i in range(10)], "width": list(range(10))})
+        pq.write_table(table, tmp_path / "0.parquet", row_group_size=4)
+        loader = UnifiedDataLoader(str(tmp_path))
+
+        batches = list(loader.iterate_record_batches())
+        loader.close()
+
+        assert pa.Table.from_batches(batches).column("width").to_pylist() == list(range(10))
+
+    def test_absent_metadata_columns_are_null(self, tmp_path):
+        """Test that requested metadata a shard lacks comes through as nulls."""
+        pq.write_table(pa.table({"url": ["a"], "width": [5]}), tmp_path / "0.parquet")
+        pq.write_table(pa.table({"url": ["b"]}), tmp_path / "1.parquet")
+        loader = UnifiedDataLoader(str(tmp_path), metadata_columns=["width"])
+
+        batches = list(loader.iterate_record_batches())
+        loader.close()
+
+        assert [batch.schema.names for batch in batches] == [
+            ["url", "caption", "key", "width"]
+        ] * 2
+        assert batches[1].column("width").null_count == 1
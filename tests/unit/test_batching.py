@@ -0,0 +1,64 @@
+"""Unit tests for the adaptive batching policy."""
+
+from engine.batching import AdaptiveBatchPolicy
+
+
+class TestAdaptiveBatchPolicy:
+    """Tests for AdaptiveBatchPolicy."""
+
+    def test_initial_limits(self):
+        """Test that the policy starts at the model's limits."""
+        policy = AdaptiveBatchPolicy(max_batch_size=16, max_wait_s=0.01)
+
+        assert policy.batch_size == 16
+        assert policy.wait_s == 0.01
+
+    def test_shrinks_when_underfilled(self):
+        """Test that the size limit halves until batches are half full."""
+        policy = AdaptiveBatchPolicy(max_batch_size=16, max_wait_s=0.01)
+
+        for _ in range(50):
+            policy.update(batch_size=1, queue_depth=0, process_s=0.05)
+
+        assert policy.batch_size == 2
+
+    def test_grows_under_backlog(self):
+        """Test that the size limit doubles up to the cap under backlog."""
+        policy = AdaptiveBatchPolicy(max_batch_size=16, max_wait_s=0.01)
+        for _ in range(50):
+            policy.update(batch_size=1, queue_depth=0, process_s=0.05)
+
+        for _ in range(10):
+            policy.update(batch_size=policy.batch_size, queue_depth=100, process_s=0.05)
+
+        assert policy.batch_size == 16
+
+    def test_wait_shrinks_with_backlog(self):
+        """Test that the fill wait goes toward zero as a backlog builds."""
+        policy = AdaptiveBatchPolicy(max_batch_size=16, max_wait_s=0.01)
+
+        policy.update(batch_size=16, queue_depth=0, process_s=0.05)
+        idle_wait = policy.wait_s
+        for _ in range(20):
+            policy.update(batch_size=16, queue_depth=64, process_s=0.05)
+
+        assert idle_wait == 0.01
+        assert policy.wait_s < idle_wait / 10
+
+    def test_wait_capped_by_processing_time(self):
+        """Test that the fill wait never exceeds half the processing time."""
+        policy = AdaptiveBatchPolicy(max_batch_size=16, max_wait_s=0.01)
+
+        policy.update(batch_size=16, queue_depth=0, process_s=0.004)
+
+        assert policy.wait_s == 0.002
+
+    def test_expected_wait(self):
+        """Test that the expected wait follows the observed throughput."""
+        policy = AdaptiveBatchPolicy(max_batch_size=16, max_wait_s=0.01)
+        assert policy.expected_wait_s(queue_depth=100) == 0.0
+
+        for _ in range(5):
+            policy.update(batch_size=16, queue_depth=0, process_s=0.1)
+
+        assert abs(policy.expected_wait_s(queue_depth=320) - 2.0) < 1e-9
@@ -62,6 +62,23 @@ class TestLoggingConfig:
             LoggingConfig(level="INVALID")
 
 
+class TestModelsConfig:
+    """Tests for ModelsConfig."""
+
+    def test_dtype_validation(self):
+        """Test inference dtype validation."""
+        assert ModelsConfig().dtype == "auto"
+
+        for dtype in ["fp32", "fp16", "bf16", "int8"]:
+            assert ModelsConfig(dtype=dtype).dtype == dtype
+
+        # Case insensitive
+        assert ModelsConfig(dtype="BF16").dtype == "bf16"
+
+        with pytest.raises(ValueError):
+            ModelsConfig(dtype="fp8")
+
+
 class TestConfig:
     """Tests for main Config class."""
 
@@ -1,9 +1,11 @@
 """Unit tests for model loader."""
 
-import json
-import tempfile
-from pathlib import Path
+import importlib.util
+import os
+import py_compile
+import types
 
+import orjson
 import pytest
 
 from engine.exceptions import ConfigurationError, ModelLoadError, ModelNotFoundError
@@ -43,11 +45,51 @@ class IncompleteModel:
         pass
 
 
+REQUIRED_METHODS = ("load", "warmup", "batch_size", "batch_wait_s", "encode")
+
+DEFAULT_CONFIG_BYTES = orjson.dumps({"name": "test-model"})
+
+
+@pytest.fixture
+def complete_model():
+    """Model stub with every required method."""
+    return types.SimpleNamespace(**dict.fromkeys(REQUIRED_METHODS, lambda: None))
+
+
 @pytest.fixture
-def temp_model_dir():
+def temp_model_dir(tmp_path):
     """Create temporary model directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
+
+
+# Bytecode of the default model.py, compiled once and copied into each
+# directory's __pycache__ so importing it skips the compile step. The pyc is
+# validated by source hash rather than mtime, so copies stay valid and edits
+# still force a recompile.
+_default_model_pyc = {}
+
+
+def _seed_default_pyc(model_path):
+    """Place compiled bytecode for the default model.py next to it.
+
+    Args:
+        model_path: Path of a model.py holding the default source
+    """
+    pyc_path = importlib.util.cache_from_source(str(model_path))
+    data = _default_model_pyc.get("pyc")
+    if data is None:
+        py_compile.compile(
+            str(model_path),
+            cfile=pyc_path,
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+        )
+        with open(pyc_path, "rb") as f:
+            _default_model_pyc["pyc"] = f.read()
+    else:
+        os.makedirs(os.path.dirname(pyc_path), exist_ok=True)
+        with open(pyc_path, "wb") as f:
+            f.write(data)
 
 
 def create_model_files(model_dir, config_data=None, model_code=None):
@@ -60,14 +102,14 @@ def create_model_files(model_dir, config_data=None, model_code=None):
     """
     # Create config.json
     if config_data is None:
-        config_data = {"name": "test-model"}
-
-    config_path = model_dir / "config.json"
-    with open(config_path, "w") as f:
-        json.dump(config_data, f)
+        config_bytes = DEFAULT_CONFIG_BYTES
+    else:
+        config_bytes = orjson.dumps(config_data)
+    (model_dir / "config.json").write_bytes(config_bytes)
 
     # Create model.py
-    if model_code is None:
+    default_code = model_code is None
+    if default_code:
         model_code = """
 class ModelImpl:
     def load(self):
@@ -89,19 +131,76 @@ class ModelImpl:
     model_path = model_dir / "model.py"
     with open(model_path, "w") as f:
         f.write(model_code)
+    if default_code:
+        _seed_default_pyc(model_path)
+
+
+def shared_model_dir(tmp_path_factory, name, **kwargs):
+    """Create a model directory shared by all tests of the session.
+
+    Args:
+        tmp_path_factory: Pytest temporary path factory
+        name: Directory name prefix
+        **kwargs: Arguments for create_model_files
+
+    Returns:
+        Model directory (tests must not modify it)
+    """
+    model_dir = tmp_path_factory.mktemp(name)
+    create_model_files(model_dir, **kwargs)
+    return model_dir
+
+
+@pytest.fixture(scope="session")
+def valid_model_dir(tmp_path_factory):
+    """Valid model directory."""
+    return shared_model_dir(
+        tmp_path_factory, "valid", config_data={"name": "test-model", "version": "1.0"}
+    )
+
+
+@pytest.fixture(scope="session")
+def full_config_model_dir(tmp_path_factory):
+    """Valid model directory with every optional config field set."""
+    config_data = {
+        "name": "test-model",
+        "version": "2.0",
+        "description": "Test model",
+        "batch_size": 32,
+        "batch_wait_s": 0.01,
+        "metadata": {"key": "value"},
+    }
+    return shared_model_dir(tmp_path_factory, "full_config", config_data=config_data)
+
+
+@pytest.fixture(scope="session")
+def missing_name_model_dir(tmp_path_factory):
+    """Model directory whose config.json has no name."""
+    return shared_model_dir(tmp_path_factory, "missing_name", config_data={"version": "1.0"})
+
+
+@pytest.fixture(scope="session")
+def no_modelimpl_model_dir(tmp_path_factory):
+    """Model directory whose model.py does not define ModelImpl."""
+    return shared_model_dir(tmp_path_factory, "no_modelimpl", model_code="class WrongName: pass")
+
+
+@pytest.fixture(scope="session")
+def syntax_error_model_dir(tmp_path_factory):
+    """Model directory whose model.py does not compile."""
+    return shared_model_dir(
+        tmp_path_factory,
+        "syntax_error",
+        model_code="class ModelImpl:\n    def invalid syntax",
+    )
 
 
 class TestLoadModel:
     """Tests for load_model function."""
 
-    def test_load_valid_model(self, temp_model_dir):
+    def test_load_valid_model(self, valid_model_dir):
         """Test loading valid model."""
-        create_model_files(
-            temp_model_dir,
-            config_data={"name": "test-model", "version": "1.0"},
-        )
-
-        model_info, model = load_model(str(temp_model_dir))
+        model_info, model = load_model(str(valid_model_dir))
 
         assert isinstance(model_info, ModelInfo)
         assert model_info.name == "test-model"
@@ -146,46 +245,26 @@ class TestLoadModel:
         with pytest.raises(ConfigurationError, match="must be a JSON object"):
             load_model(str(temp_model_dir))
 
-    def test_load_model_config_missing_name(self, temp_model_dir):
+    def test_load_model_config_missing_name(self, missing_name_model_dir):
         """Test error when config.json doesn't have 'name' field."""
-        create_model_files(temp_model_dir, config_data={"version": "1.0"})
-
         with pytest.raises(ConfigurationError, match="must contain 'name'"):
-            load_model(str(temp_model_dir))
+            load_model(str(missing_name_model_dir))
 
     def test_load_model_py_missing(self, temp_model_dir):
         """Test error when model.py is missing."""
-        config_path = temp_model_dir / "config.json"
-        with open(config_path, "w") as f:
-            json.dump({"name": "test"}, f)
+        (temp_model_dir / "config.json").write_bytes(DEFAULT_CONFIG_BYTES)
 
         with pytest.raises(ModelLoadError, match="model.py not found"):
             load_model(str(temp_model_dir))
 
-    def test_load_model_no_modelimpl_class(self, temp_model_dir):
+    def test_load_model_no_modelimpl_class(self, no_modelimpl_model_dir):
         """Test error when model.py doesn't define ModelImpl."""
-        create_model_files(
-            temp_model_dir,
-            model_code="class WrongName: pass",
-        )
-
         with pytest.raises(ModelLoadError, match="must define ModelImpl"):
-            load_model(str(temp_model_dir))
+            load_model(str(no_modelimpl_model_dir))
 
-    def test_load_model_with_optional_fields(self, temp_model_dir):
+    def test_load_model_with_optional_fields(self, full_config_model_dir):
         """Test loading model with optional config fields."""
-        config_data = {
-            "name": "test-model",
-            "version": "2.0",
-            "description": "Test model",
-            "batch_size": 32,
-            "batch_wait_s": 0.01,
-            "metadata": {"key": "value"},
-        }
-
-        create_model_files(temp_model_dir, config_data=config_data)
-
-        model_info, model = load_model(str(temp_model_dir))
+        model_info, model = load_model(str(full_config_model_dir))
 
         assert model_info.name == "test-model"
         assert model_info.version == "2.0"
@@ -194,15 +273,33 @@ class TestLoadModel:
         assert model_info.batch_wait_s == 0.01
         assert model_info.metadata == {"key": "value"}
 
-    def test_load_model_with_syntax_error(self, temp_model_dir):
+    def test_load_model_with_syntax_error(self, syntax_error_model_dir):
         """Test error when model.py has syntax error."""
-        create_model_files(
-            temp_model_dir,
-            model_code="class ModelImpl:\n    def invalid syntax",
-        )
-
         with pytest.raises(ModelLoadError):
-            load_model(str(temp_model_dir))
+            load_model(str(syntax_error_model_dir))
+
+    def test_load_model_reuses_module(self, valid_model_dir):
+        """Test that an unchanged model.py is only executed once."""
+        _, first = load_model(str(valid_model_dir))
+        _, second = load_model(str(valid_model_dir))
+
+        assert first is not second
+        assert type(first) is type(second)
+
+    def test_load_model_reloads_changed_module(self, temp_model_dir):
+        """Test that an edited model.py is executed again."""
+        create_model_files(temp_model_dir)
+        _, first = load_model(str(temp_model_dir))
+
+        model_py = temp_model_dir / "model.py"
+        model_py.write_text(model_py.read_text().replace("16", "32"))
+        stat = model_py.stat()
+        os.utime(model_py, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        _, second = load_model(str(temp_model_dir))
+
+        assert type(first) is not type(second)
+        assert second.batch_size() == 32
 
 
 class TestValidateModelInterface:
@@ -233,22 +330,10 @@ class TestValidateModelInterface:
         with pytest.raises(ModelLoadError, match="must be callable"):
             validate_model_interface(model)
 
-    @pytest.mark.parametrize(
-        "method_name",
-        ["load", "warmup", "batch_size", "batch_wait_s", "encode"],
-    )
-    def test_validate_each_required_method(self, method_name):
+    @pytest.mark.parametrize("method_name", REQUIRED_METHODS)
+    def test_validate_each_required_method(self, complete_model, method_name):
         """Test each required method is validated."""
-
-        class PartialModel:
-            pass
-
-        model = PartialModel()
-
-        # Add all methods except the one being tested
-        for method in ["load", "warmup", "batch_size", "batch_wait_s", "encode"]:
-            if method != method_name:
-                setattr(model, method, lambda: None)
+        delattr(complete_model, method_name)
 
         with pytest.raises(ModelLoadError, match=f"'{method_name}'"):
-            validate_model_interface(model)
+            validate_model_interface(complete_model)
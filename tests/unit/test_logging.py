@@ -0,0 +1,118 @@
+"""Unit tests for logging configuration."""
+
+import io
+import json
+import logging
+import sys
+import time
+
+from engine.logging import BufferedStreamHandler, JSONFormatter
+
+
+def create_record(msg="hello %s", args=("world",), **extra):
+    """Create a log record.
+
+    Args:
+        msg: Message format string
+        args: Message arguments
+        **extra: Extra attributes to set on the record
+
+    Returns:
+        LogRecord
+    """
+    record = logging.LogRecord(
+        name="test",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=10,
+        msg=msg,
+        args=args,
+        exc_info=None,
+        func="test_func",
+    )
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestJSONFormatter:
+    """Tests for JSONFormatter."""
+
+    def test_format_fields(self):
+        """Test that a record is formatted as one JSON object."""
+        record = create_record()
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["timestamp"] == record.created
+        assert data["level"] == "INFO"
+        assert data["logger"] == "test"
+        assert data["message"] == "hello world"
+        assert data["function"] == "test_func"
+        assert data["line"] == 10
+
+    def test_extra_fields(self):
+        """Test that known extra fields are included."""
+        record = create_record(request_id="req-1", duration_ms=1.5, batch_size=8)
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["request_id"] == "req-1"
+        assert data["duration_ms"] == 1.5
+        assert data["batch_size"] == 8
+
+    def test_exception(self):
+        """Test that exception info is formatted."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = create_record()
+            record.exc_info = sys.exc_info()
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert "ValueError: boom" in data["exception"]
+
+
+class TestBufferedStreamHandler:
+    """Tests for BufferedStreamHandler."""
+
+    def test_writes_when_full(self):
+        """Test that records are held until the buffer is full."""
+        stream = io.StringIO()
+        handler = BufferedStreamHandler(stream, capacity=2, flush_interval_s=60)
+
+        handler.handle(create_record("first", ()))
+        assert stream.getvalue() == ""
+
+        handler.handle(create_record("second", ()))
+        assert stream.getvalue() == "first\nsecond\n"
+        handler.close()
+
+    def test_errors_written_immediately(self):
+        """Test that an ERROR record writes the buffer at once."""
+        stream = io.StringIO()
+        handler = BufferedStreamHandler(stream, capacity=100, flush_interval_s=60)
+
+        handler.handle(create_record("info", ()))
+        record = create_record("error", ())
+        record.levelno = logging.ERROR
+        handler.handle(record)
+
+        assert stream.getvalue() == "info\nerror\n"
+        handler.close()
+
+    def test_flush_interval_and_close(self):
+        """Test that buffered records are written periodically and on close."""
+        stream = io.StringIO()
+        handler = BufferedStreamHandler(stream, capacity=100, flush_interval_s=0.01)
+
+        handler.handle(create_record("periodic", ()))
+        deadline = time.monotonic() + 2
+        while not stream.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stream.getvalue() == "periodic\n"
+
+        handler.handle(create_record("last", ()))
+        handler.close()
+        assert stream.getvalue() == "periodic\nlast\n"
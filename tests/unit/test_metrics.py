@@ -0,0 +1,71 @@
+"""Unit tests for metrics collection."""
+
+from prometheus_client import REGISTRY
+
+from engine.metrics import MetricsCollector
+
+
+def sample(name, **labels):
+    """Read a sample value from the default registry (0 if unset)."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsCollector:
+    """Tests for MetricsCollector."""
+
+    def test_record_request(self):
+        """Test that requests are counted per status and timed."""
+        collector = MetricsCollector("test-request")
+
+        collector.record_request("success", 0.01)
+        collector.record_request("success", 0.02)
+        collector.record_request("cancelled", 0.03)
+
+        assert sample(
+            "inference_requests_total", model="test-request", status="success"
+        ) == 2
+        assert sample(
+            "inference_requests_total", model="test-request", status="cancelled"
+        ) == 1
+        assert sample(
+            "inference_request_duration_seconds_count", model="test-request"
+        ) == 3
+
+    def test_record_requests(self):
+        """Test that a batch of requests is counted and timed at once."""
+        collector = MetricsCollector("test-requests")
+
+        collector.record_requests("success", [0.01, 0.02, 0.03])
+        collector.record_requests("success", [])
+
+        assert sample(
+            "inference_requests_total", model="test-requests", status="success"
+        ) == 3
+        assert sample(
+            "inference_request_duration_seconds_count", model="test-requests"
+        ) == 3
+
+    def test_record_error(self):
+        """Test that errors are counted per type."""
+        collector = MetricsCollector("test-error")
+
+        collector.record_error("timeout")
+        collector.record_error("timeout")
+
+        assert sample(
+            "inference_errors_total", model="test-error", error_type="timeout"
+        ) == 2
+
+    def test_batch_and_queue(self):
+        """Test batch and queue metrics use the collector's model label."""
+        collector = MetricsCollector("test-batch")
+
+        collector.record_batch(8, 0.005)
+        collector.update_queue_depth(3)
+        collector.record_queue_rejection()
+
+        assert sample("inference_batch_size_sum", model="test-batch") == 8
+        assert sample("inference_queue_depth", model="test-batch") == 3
+        assert sample(
+            "inference_queue_rejections_total", model="test-batch"
+        ) == 1
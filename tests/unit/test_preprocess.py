@@ -0,0 +1,121 @@
+"""Unit tests for image preprocessing kernels."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from engine import preprocess
+from engine.preprocess import crop_images, normalize_images, resize_center_crop
+
+MEAN = (0.48145466, 0.4578275, 0.40821073)
+STD = (0.26862954, 0.26130258, 0.27577711)
+
+
+def reference_normalize(images, mean, std):
+    """Unfused reference: scale, subtract, divide, transpose."""
+    x = images.astype(np.float32) / 255.0
+    x = (x - np.asarray(mean, dtype=np.float32)) / np.asarray(std, dtype=np.float32)
+    return x.transpose(0, 3, 1, 2)
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "numpy"])
+def kernel(request, monkeypatch):
+    """Run each test with the Numba kernel (if installed) and the fallback."""
+    if request.param and not preprocess.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(preprocess, "NUMBA_AVAILABLE", request.param)
+
+
+class TestNormalizeImages:
+    """Tests for normalize_images function."""
+
+    def test_matches_reference(self, kernel):
+        """Test fused output matches the unfused numpy computation."""
+        rng = np.random.default_rng(0)
+        images = rng.integers(0, 256, size=(3, 8, 6, 3), dtype=np.uint8)
+
+        out = normalize_images(images, MEAN, STD)
+
+        assert out.dtype == np.float32
+        assert out.shape == (3, 3, 8, 6)
+        np.testing.assert_allclose(
+            out, reference_normalize(images, MEAN, STD), rtol=1e-5, atol=1e-5
+        )
+
+    def test_writes_into_out(self, kernel):
+        """Test that a provided output array is filled in place."""
+        images = np.full((2, 4, 4, 3), 255, dtype=np.uint8)
+        out = np.zeros((2, 3, 4, 4), dtype=np.float32)
+
+        result = normalize_images(images, (0.5, 0.5, 0.5), (0.5, 0.5, 0.5), out=out)
+
+        assert result is out
+        np.testing.assert_allclose(out, 1.0, rtol=1e-6)
+
+    def test_rejects_wrong_input(self):
+        """Test that non-uint8 or non-RGB input is rejected."""
+        with pytest.raises(ValueError, match="uint8 images"):
+            normalize_images(np.zeros((1, 4, 4, 3), dtype=np.float32), MEAN, STD)
+
+        with pytest.raises(ValueError, match="uint8 images"):
+            normalize_images(np.zeros((1, 4, 4), dtype=np.uint8), MEAN, STD)
+
+    def test_rejects_wrong_output(self):
+        """Test that a mismatched output array is rejected."""
+        images = np.zeros((1, 4, 4, 3), dtype=np.uint8)
+
+        with pytest.raises(ValueError, match="float32 output"):
+            normalize_images(
+                images, MEAN, STD, out=np.zeros((1, 3, 4, 5), dtype=np.float32)
+            )
+
+
+class TestResizeCenterCrop:
+    """Tests for resize_center_crop function."""
+
+    @pytest.mark.parametrize("width,height", [(400, 300), (300, 400), (100, 50), (224, 224)])
+    def test_output_size(self, width, height):
+        """Test that any input is resized and cropped to a square."""
+        img = Image.new("RGB", (width, height), color="red")
+
+        result = resize_center_crop(img, 224)
+
+        assert result.size == (224, 224)
+
+    def test_crop_is_centered(self):
+        """Test that the crop keeps the middle of the longer side."""
+        img = Image.new("RGB", (300, 100), color="black")
+        img.paste((255, 255, 255), (100, 0, 200, 100))
+
+        result = np.asarray(resize_center_crop(img, 100))
+
+        assert result.min() == 255
+
+
+class TestCropImages:
+    """Tests for crop_images function."""
+
+    def test_matches_serial_crop(self):
+        """Test that parallel crops match cropping each image in turn."""
+        rng = np.random.default_rng(0)
+        images = [
+            Image.fromarray(rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8))
+            for w, h in [(40, 30), (30, 50), (32, 32)]
+        ]
+
+        result = crop_images(images, 16)
+
+        assert result.shape == (3, 16, 16, 3)
+        for row, image in zip(result, images):
+            np.testing.assert_array_equal(row, np.asarray(resize_center_crop(image, 16)))
+
+    def test_converts_to_rgb_into_out(self):
+        """Test that non-RGB images are converted and written in place."""
+        out = np.zeros((2, 8, 8, 3), dtype=np.uint8)
+        images = [Image.new("L", (8, 8), color=200), Image.new("RGBA", (8, 8), "blue")]
+
+        result = crop_images(images, 8, out=out)
+
+        assert result is out
+        assert (out[0] == 200).all()
+        assert out[1, 0, 0].tolist() == [0, 0, 255]
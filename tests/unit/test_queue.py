@@ -1,6 +1,7 @@
 """Unit tests for request queue."""
 
 import asyncio
+import time
 
 import pytest
 
@@ -9,12 +10,45 @@ from engine.queue import RequestQueue
 from engine.types import InferenceRequest
 
 
-@pytest.fixture
-def queue():
-    """Create request queue fixture."""
+def make_requests(n):
+    """Create requests with ids 0..n-1 on the running event loop.
+
+    Args:
+        n: Number of requests
+
+    Returns:
+        List of InferenceRequest
+    """
+    loop = asyncio.get_running_loop()
+    return [InferenceRequest(payload={"id": i}, future=loop.create_future()) for i in range(n)]
+
+
+@pytest.fixture(scope="module")
+def shared_queue():
+    """Create one request queue for the module."""
     return RequestQueue(maxsize=10)
 
 
+@pytest.fixture
+def queue(shared_queue):
+    """Provide the module's request queue, emptied and with zeroed counters."""
+    shared_queue.reset()
+    return shared_queue
+
+
+@pytest.fixture(scope="module")
+def full_queue(event_loop):
+    """Create one queue of size 1, filled once for the module.
+
+    Tests only exercise the rejection path, which leaves it unchanged apart
+    from the rejection counter.
+    """
+    queue = RequestQueue(maxsize=1)
+    request = InferenceRequest(payload={"test": "data"}, future=event_loop.create_future())
+    event_loop.run_until_complete(queue.put(request))
+    return queue
+
+
 @pytest.fixture
 def inference_request():
     """Create inference request fixture."""
@@ -41,19 +75,10 @@ class TestRequestQueue:
         assert not queue.is_empty()
 
     @pytest.mark.asyncio
-    async def test_put_queue_full(self, inference_request):
+    async def test_put_queue_full(self, full_queue, inference_request):
         """Test queue full error."""
-        small_queue = RequestQueue(maxsize=1)
-
-        # Fill queue
-        await small_queue.put(inference_request)
-
-        # Try to add another
-        future = asyncio.Future()
-        request2 = InferenceRequest(payload={"test": "data2"}, future=future)
-
         with pytest.raises(QueueFullError) as exc_info:
-            await small_queue.put(request2)
+            await full_queue.put(inference_request)
 
         assert "full" in str(exc_info.value).lower()
         assert exc_info.value.queue_depth == 1
@@ -72,13 +97,9 @@ class TestRequestQueue:
     @pytest.mark.asyncio
     async def test_get_batch_multiple(self, queue):
         """Test getting multiple requests as batch."""
-        # Add multiple requests
-        requests = []
-        for i in range(3):
-            future = asyncio.Future()
-            req = InferenceRequest(payload={"id": i}, future=future)
+        requests = make_requests(3)
+        for req in requests:
             await queue.put(req)
-            requests.append(req)
 
         batch = await queue.get_batch(batch_size=5, timeout_s=0.1)
 
@@ -89,11 +110,7 @@ class TestRequestQueue:
     @pytest.mark.asyncio
     async def test_get_batch_limited_by_size(self, queue):
         """Test batch size limit."""
-        # Add 5 requests
-        for i in range(5):
-            future = asyncio.Future()
-            req = InferenceRequest(payload={"id": i}, future=future)
-            await queue.put(req)
+        await asyncio.gather(*(queue.put(req) for req in make_requests(5)))
 
         # Get batch of max 3
         batch = await queue.get_batch(batch_size=3, timeout_s=0.1)
@@ -101,6 +118,18 @@ class TestRequestQueue:
         assert len(batch) == 3
         assert queue.depth() == 2  # 2 remaining
 
+    @pytest.mark.asyncio
+    async def test_get_batch_returns_remaining(self, queue):
+        """Test that leftover requests are returned without waiting."""
+        for req in make_requests(5):
+            await queue.put(req)
+
+        await queue.get_batch(batch_size=3, timeout_s=0.1)
+        batch = await queue.get_batch(batch_size=3, timeout_s=0.01)
+
+        assert [req.payload["id"] for req in batch] == [3, 4]
+        assert queue.get_metrics()["total_timeouts"] == 0
+
     @pytest.mark.asyncio
     async def test_get_batch_timeout(self, queue):
         """Test batch get timeout."""
@@ -130,36 +159,170 @@ class TestRequestQueue:
         assert len(batch) == 1
         assert batch[0].payload["delayed"] is True
 
-    def test_depth(self, queue):
+    @pytest.mark.asyncio
+    async def test_get_waits_for_request(self, queue):
+        """Test that get blocks until a request arrives."""
+        req = InferenceRequest(payload={}, future=asyncio.get_running_loop().create_future())
+
+        async def add_delayed():
+            await asyncio.sleep(0.02)
+            await queue.put(req)
+
+        task = asyncio.create_task(add_delayed())
+        result = await asyncio.wait_for(queue.get(), timeout=1)
+        await task
+
+        assert result is req
+        assert queue.is_empty()
+
+    @pytest.mark.asyncio
+    async def test_extend_batch_waits_to_fill(self, queue):
+        """Test that extend_batch takes late arrivals until the batch is full."""
+        requests = make_requests(3)
+        await queue.put(requests[0])
+
+        async def add_delayed():
+            await asyncio.sleep(0.02)
+            await queue.put(requests[2])
+
+        task = asyncio.create_task(add_delayed())
+        batch = await queue.extend_batch([requests[1]], max_size=3, timeout_s=1)
+        await task
+
+        assert batch == [requests[1], requests[0], requests[2]]
+
+    @pytest.mark.asyncio
+    async def test_extend_batch_timeout(self, queue):
+        """Test that extend_batch returns a partial batch after the timeout."""
+        loop = asyncio.get_running_loop()
+        first = InferenceRequest(payload={}, future=loop.create_future())
+
+        batch = await queue.extend_batch([first], max_size=4, timeout_s=0.01)
+
+        assert batch == [first]
+
+    @pytest.mark.asyncio
+    async def test_priority_then_deadline_order(self, queue):
+        """Test that higher priorities, then earlier deadlines, come first."""
+        loop = asyncio.get_running_loop()
+        now_ns = time.monotonic_ns()
+        late = InferenceRequest(
+            payload={}, future=loop.create_future(), deadline_ns=now_ns + 10**10
+        )
+        soon = InferenceRequest(
+            payload={}, future=loop.create_future(), deadline_ns=now_ns + 10**9
+        )
+        urgent = InferenceRequest(payload={}, future=loop.create_future(), priority=5)
+        for req in (late, soon, urgent):
+            await queue.put(req)
+
+        batch = await queue.get_batch(batch_size=3, timeout_s=0.1)
+
+        assert batch == [urgent, soon, late]
+
+    @pytest.mark.asyncio
+    async def test_expired_requests_fail(self, queue):
+        """Test that expired and abandoned requests are not batched."""
+        loop = asyncio.get_running_loop()
+        expired = InferenceRequest(
+            payload={}, future=loop.create_future(), deadline_ns=time.monotonic_ns()
+        )
+        cancelled = InferenceRequest(payload={}, future=loop.create_future())
+        cancelled.future.cancel()
+        live = InferenceRequest(payload={}, future=loop.create_future())
+        for req in (expired, cancelled, live):
+            await queue.put(req)
+
+        assert await queue.get() is live
+        assert queue.is_empty()
+        with pytest.raises(asyncio.TimeoutError):
+            expired.future.result()
+        assert queue.get_metrics()["total_expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expire_covers_taken_requests(self, queue):
+        """Test that expire fails overdue requests, queued or already taken."""
+        loop = asyncio.get_running_loop()
+        soon_ns = time.monotonic_ns() + 10**7
+        taken, queued = [
+            InferenceRequest(payload={}, future=loop.create_future(), deadline_ns=soon_ns)
+            for _ in range(2)
+        ]
+        pending = InferenceRequest(
+            payload={}, future=loop.create_future(), deadline_ns=soon_ns + 10**10
+        )
+        await queue.put(taken)
+        assert await queue.get() is taken
+        await queue.put(queued)
+        await queue.put(pending)
+        await asyncio.sleep(0.02)
+
+        assert queue.expire() == 2
+
+        assert isinstance(taken.future.exception(), asyncio.TimeoutError)
+        assert isinstance(queued.future.exception(), asyncio.TimeoutError)
+        assert not pending.future.done()
+        assert await queue.get() is pending
+
+    @pytest.mark.asyncio
+    async def test_drain(self, queue):
+        """Test that drain returns unfinished queued and taken requests."""
+        loop = asyncio.get_running_loop()
+        deadline_ns = time.monotonic_ns() + 10**10
+        taken, queued, done = [
+            InferenceRequest(payload={}, future=loop.create_future(), deadline_ns=deadline_ns)
+            for _ in range(3)
+        ]
+        await queue.put(taken)
+        assert await queue.get() is taken
+        await queue.put(queued)
+        await queue.put(done)
+        done.future.set_result(None)
+
+        drained = queue.drain()
+
+        assert sorted(map(id, drained)) == sorted(map(id, [taken, queued]))
+        assert queue.is_empty()
+        assert queue.expire() == 0
+
+    @pytest.mark.asyncio
+    async def test_depth(self, queue):
         """Test queue depth."""
         assert queue.depth() == 0
 
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         req = InferenceRequest(payload={}, future=future)
 
-        asyncio.run(queue.put(req))
+        await queue.put(req)
         assert queue.depth() == 1
 
-    def test_is_empty(self, queue):
+    @pytest.mark.asyncio
+    async def test_is_empty(self, queue):
         """Test is_empty check."""
         assert queue.is_empty()
 
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         req = InferenceRequest(payload={}, future=future)
-        asyncio.run(queue.put(req))
+        await queue.put(req)
 
         assert not queue.is_empty()
 
-    def test_is_full(self):
-        """Test is_full check."""
-        small_queue = RequestQueue(maxsize=1)
-        assert not small_queue.is_full()
+    @pytest.mark.asyncio
+    async def test_reset(self, queue):
+        """Test that reset empties the queue and zeroes the counters."""
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(InferenceRequest(payload={}, future=future))
 
-        future = asyncio.Future()
-        req = InferenceRequest(payload={}, future=future)
-        asyncio.run(small_queue.put(req))
+        queue.reset()
+
+        assert queue.is_empty()
+        assert queue.get_metrics()["total_requests"] == 0
 
-        assert small_queue.is_full()
+    @pytest.mark.asyncio
+    async def test_is_full(self, full_queue):
+        """Test is_full check."""
+        assert not RequestQueue(maxsize=1).is_full()
+        assert full_queue.is_full()
 
     def test_get_metrics(self, queue):
         """Test getting queue metrics."""
@@ -180,11 +343,7 @@ class TestRequestQueue:
     @pytest.mark.asyncio
     async def test_metrics_tracking(self, queue):
         """Test that metrics are tracked correctly."""
-        # Add requests
-        for i in range(3):
-            future = asyncio.Future()
-            req = InferenceRequest(payload={"id": i}, future=future)
-            await queue.put(req)
+        await asyncio.gather(*(queue.put(req) for req in make_requests(3)))
 
         metrics = queue.get_metrics()
         assert metrics["total_requests"] == 3
@@ -199,23 +358,14 @@ class TestRequestQueue:
         assert metrics["utilization"] == 0.0
 
     @pytest.mark.asyncio
-    async def test_rejection_tracking(self):
+    async def test_rejection_tracking(self, full_queue, inference_request):
         """Test rejection tracking."""
-        small_queue = RequestQueue(maxsize=1)
-
-        future1 = asyncio.Future()
-        req1 = InferenceRequest(payload={}, future=future1)
-        await small_queue.put(req1)
-
-        # Try to add when full
-        future2 = asyncio.Future()
-        req2 = InferenceRequest(payload={}, future=future2)
+        rejections = full_queue.get_metrics()["total_rejections"]
 
         with pytest.raises(QueueFullError):
-            await small_queue.put(req2)
+            await full_queue.put(inference_request)
 
-        metrics = small_queue.get_metrics()
-        assert metrics["total_rejections"] == 1
+        assert full_queue.get_metrics()["total_rejections"] == rejections + 1
 
     @pytest.mark.asyncio
     async def test_timeout_tracking(self, queue):
@@ -1,74 +1,79 @@
 """Unit tests for types module."""
 
 import asyncio
-import time
+import dataclasses
+import itertools
 
 import pytest
 
+import engine.types
 from engine.types import InferenceRequest, InferenceResponse, ModelInfo
 
 
+@pytest.fixture
+def request_factory(event_loop):
+    """Build requests whose futures are bound to the session's event loop."""
+
+    def make(payload=None, **kwargs):
+        return InferenceRequest(
+            payload={} if payload is None else payload,
+            future=event_loop.create_future(),
+            **kwargs,
+        )
+
+    return make
+
+
 class TestInferenceRequest:
     """Tests for InferenceRequest."""
 
-    def test_creation_with_defaults(self):
+    def test_creation_with_defaults(self, request_factory):
         """Test creating request with default values."""
-        future = asyncio.Future()
         payload = {"image": "test", "text": "test"}
 
-        request = InferenceRequest(payload=payload, future=future)
+        request = request_factory(payload)
 
         assert request.payload == payload
-        assert request.future == future
+        assert isinstance(request.future, asyncio.Future)
         assert request.request_id is not None
         assert len(request.request_id) > 0
         assert request.enqueue_ts > 0
         assert isinstance(request.metadata, dict)
         assert len(request.metadata) == 0
 
-    def test_unique_request_ids(self):
+    def test_unique_request_ids(self, request_factory):
         """Test that each request gets a unique ID."""
-        future1 = asyncio.Future()
-        future2 = asyncio.Future()
-
-        request1 = InferenceRequest(payload={}, future=future1)
-        request2 = InferenceRequest(payload={}, future=future2)
+        request1 = request_factory()
+        request2 = request_factory()
 
         assert request1.request_id != request2.request_id
 
-    def test_age_ms(self):
+    def test_age_ms(self, request_factory):
         """Test calculating request age in milliseconds."""
-        future = asyncio.Future()
-        request = InferenceRequest(payload={}, future=future)
+        request = request_factory()
 
-        time.sleep(0.01)  # Wait 10ms
+        age = request.age_ms(now_ns=request.enqueue_ts + 15_000_000)
 
-        age = request.age_ms()
-        assert age >= 10
-        assert age < 100  # Should be less than 100ms
+        assert age == 15.0
 
-    def test_age_ms_increases(self):
-        """Test that age increases over time."""
-        future = asyncio.Future()
-        request = InferenceRequest(payload={}, future=future)
+    def test_age_ms_increases(self, request_factory, monkeypatch):
+        """Test that age increases with the monotonic clock."""
+        request = request_factory(enqueue_ts=0)
+        monkeypatch.setattr(
+            engine.types.time, "monotonic_ns", itertools.count(15_000_000, 15_000_000).__next__
+        )
 
         age1 = request.age_ms()
-        time.sleep(0.01)
         age2 = request.age_ms()
 
-        assert age2 > age1
+        assert age1 == 15.0
+        assert age2 == 30.0
 
-    def test_to_dict(self):
+    def test_to_dict(self, request_factory):
         """Test converting request to dictionary."""
-        future = asyncio.Future()
-        payload = {"test": "data"}
         metadata = {"key": "value"}
 
-        request = InferenceRequest(
-            payload=payload,
-            future=future,
-            metadata=metadata,
-        )
+        request = request_factory({"test": "data"}, metadata=metadata)
 
         result = request.to_dict()
 
@@ -79,16 +84,12 @@ class TestInferenceRequest:
         assert result["request_id"] == request.request_id
         assert result["metadata"] == metadata
 
-    def test_custom_metadata(self):
+    @pytest.mark.parametrize(
+        "metadata", [{"key": "value"}, {"user_id": "123", "priority": "high"}]
+    )
+    def test_custom_metadata(self, request_factory, metadata):
         """Test request with custom metadata."""
-        future = asyncio.Future()
-        metadata = {"user_id": "123", "priority": "high"}
-
-        request = InferenceRequest(
-            payload={},
-            future=future,
-            metadata=metadata,
-        )
+        request = request_factory(metadata=metadata)
 
         assert request.metadata == metadata
 
@@ -217,6 +218,15 @@ class TestModelInfo:
         assert result["batch_wait_s"] == 0.005
         assert result["metadata"] == {"type": "embedding"}
 
+    def test_immutable(self):
+        """Test that ModelInfo cannot be modified after creation."""
+        info = ModelInfo(name="test-model")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            info.batch_size = 64
+
+        assert info.to_dict() is info.to_dict()
+
     def test_default_values(self):
         """Test default values are used."""
         info = ModelInfo(name="minimal")
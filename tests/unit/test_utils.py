@@ -1,9 +1,11 @@
 """Unit tests for utility functions."""
 
+import functools
 import io
+import types
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageFile
 
 from engine.exceptions import InvalidImageError
 from engine.utils import (
@@ -14,9 +16,12 @@ from engine.utils import (
 )
 
 
+@functools.lru_cache(maxsize=64)
 def create_test_image(width=100, height=100, mode="RGB"):
     """Create a test image.
 
+    Cached per shape and mode, so callers must not modify it in place.
+
     Args:
         width: Image width
         height: Image height
@@ -28,6 +33,22 @@ def create_test_image(width=100, height=100, mode="RGB"):
     return Image.new(mode, (width, height), color="red")
 
 
+@functools.lru_cache(maxsize=64)
+def create_test_image_bytes(width=100, height=100, mode="RGB", format="PNG"):
+    """Create an encoded test image, encoding each variant only once.
+
+    Args:
+        width: Image width
+        height: Image height
+        mode: Image mode
+        format: Image format
+
+    Returns:
+        Image bytes
+    """
+    return image_to_bytes(create_test_image(width, height, mode), format=format)
+
+
 def image_to_bytes(img, format="PNG"):
     """Convert PIL image to bytes.
 
@@ -48,8 +69,7 @@ class TestDecodeImage:
 
     def test_decode_valid_image(self):
         """Test decoding valid image."""
-        img = create_test_image(100, 100)
-        img_bytes = image_to_bytes(img)
+        img_bytes = create_test_image_bytes(100, 100)
 
         decoded = decode_image(img_bytes)
 
@@ -69,8 +89,7 @@ class TestDecodeImage:
 
     def test_decode_grayscale_converts_to_rgb(self):
         """Test that grayscale images are converted to RGB."""
-        img = create_test_image(100, 100, mode="L")
-        img_bytes = image_to_bytes(img)
+        img_bytes = create_test_image_bytes(100, 100, mode="L")
 
         decoded = decode_image(img_bytes)
 
@@ -78,8 +97,7 @@ class TestDecodeImage:
 
     def test_decode_rgba_converts_to_rgb(self):
         """Test that RGBA images are converted to RGB."""
-        img = create_test_image(100, 100, mode="RGBA")
-        img_bytes = image_to_bytes(img, format="PNG")
+        img_bytes = create_test_image_bytes(100, 100, mode="RGBA", format="PNG")
 
         decoded = decode_image(img_bytes)
 
@@ -88,18 +106,63 @@ class TestDecodeImage:
     @pytest.mark.parametrize("format", ["PNG", "JPEG", "BMP"])
     def test_decode_different_formats(self, format):
         """Test decoding different image formats."""
-        img = create_test_image(50, 50)
-
-        # JPEG doesn't support transparency, so use RGB
-        if format == "JPEG":
-            img = img.convert("RGB")
-
-        img_bytes = image_to_bytes(img, format=format)
+        img_bytes = create_test_image_bytes(50, 50, format=format)
         decoded = decode_image(img_bytes)
 
         assert isinstance(decoded, Image.Image)
         assert decoded.mode == "RGB"
 
+    @pytest.mark.parametrize(
+        "min_size,expected",
+        [(None, (800, 600)), (300, (400, 300)), (100, (200, 150)), (1000, (800, 600))],
+    )
+    def test_decode_jpeg_min_size_uses_dct_scaling(self, min_size, expected):
+        """Test that JPEGs are decoded at the smallest scale covering min_size."""
+        img_bytes = create_test_image_bytes(800, 600, format="JPEG")
+
+        decoded = decode_image(img_bytes, min_size=min_size)
+
+        assert decoded.size == expected
+        assert decoded.mode == "RGB"
+
+    def test_decode_png_ignores_min_size(self):
+        """Test that non-JPEG images are always decoded at full size."""
+        img_bytes = create_test_image_bytes(800, 600, format="PNG")
+
+        decoded = decode_image(img_bytes, min_size=100)
+
+        assert decoded.size == (800, 600)
+
+    def test_decode_buffer_and_file(self):
+        """Test decoding from a memoryview and from a file object."""
+        img_bytes = create_test_image_bytes(60, 40)
+
+        from_view = decode_image(memoryview(img_bytes))
+        from_file = decode_image(io.BytesIO(img_bytes))
+
+        assert from_view.size == (60, 40)
+        assert from_file.size == (60, 40)
+
+    def test_decode_rejects_oversized_before_decoding(self, monkeypatch):
+        """Test that max_size_mb is checked from the header alone."""
+        img_bytes = create_test_image_bytes(1000, 1000)
+
+        def fail_load(self):
+            raise AssertionError("pixels decoded")
+
+        monkeypatch.setattr(ImageFile.ImageFile, "load", fail_load)
+
+        with pytest.raises(InvalidImageError, match="Image too large"):
+            decode_image(img_bytes, max_size_mb=1.0)
+
+    def test_decode_accepts_within_max_size(self):
+        """Test that images under max_size_mb decode normally."""
+        img_bytes = create_test_image_bytes(100, 100, mode="L")
+
+        decoded = decode_image(img_bytes, max_size_mb=1.0)
+
+        assert decoded.size == (100, 100)
+
 
 class TestValidateImageSize:
     """Tests for validate_image_size function."""
@@ -113,8 +176,8 @@ class TestValidateImageSize:
 
     def test_validate_large_image_fails(self):
         """Test validation fails for large image."""
-        # Create large image (2000x2000 RGB = 12MB)
-        img = create_test_image(2000, 2000)
+        # Only size and mode are read, so skip allocating 2000x2000 RGB (12MB)
+        img = types.SimpleNamespace(size=(2000, 2000), mode="RGB")
 
         with pytest.raises(InvalidImageError, match="too large"):
             validate_image_size(img, max_size_mb=1.0)
@@ -164,78 +227,46 @@ class TestGetImageInfo:
         assert info["channels"] == 4
 
 
-class TestResizeImage:
-    """Tests for resize_image function."""
-
-    def test_resize_no_change_needed(self):
-        """Test resize when image is already small enough."""
-        img = create_test_image(500, 400)
-
-        resized = resize_image(img, max_width=1024, max_height=1024)
-
-        # Should return same image
-        assert resized.size == (500, 400)
-
-    def test_resize_width_exceeded(self):
-        """Test resize when width exceeds maximum."""
-        img = create_test_image(2000, 1000)
-
-        resized = resize_image(img, max_width=1024, max_height=1024)
-
-        # Width should be 1024, height proportionally scaled
-        assert resized.size[0] == 1024
-        assert resized.size[1] == 512  # 1000 * 0.512
+@pytest.fixture(scope="module")
+def src_image(request):
+    """Test image of size ``request.param``, shared by the module's tests."""
+    return create_test_image(*request.param)
 
-    def test_resize_height_exceeded(self):
-        """Test resize when height exceeds maximum."""
-        img = create_test_image(1000, 2000)
-
-        resized = resize_image(img, max_width=1024, max_height=1024)
-
-        # Height should be 1024, width proportionally scaled
-        assert resized.size[1] == 1024
-        assert resized.size[0] == 512  # 1000 * 0.512
-
-    def test_resize_both_exceeded(self):
-        """Test resize when both dimensions exceed maximum."""
-        img = create_test_image(3000, 2000)
-
-        resized = resize_image(img, max_width=1024, max_height=1024)
-
-        # Should scale to maintain aspect ratio
-        assert resized.size[0] <= 1024
-        assert resized.size[1] <= 1024
-
-        # Check aspect ratio preserved (approximately)
-        original_ratio = 3000 / 2000
-        new_ratio = resized.size[0] / resized.size[1]
-        assert abs(original_ratio - new_ratio) < 0.01
-
-    def test_resize_square_image(self):
-        """Test resizing square image."""
-        img = create_test_image(2000, 2000)
-
-        resized = resize_image(img, max_width=500, max_height=500)
-
-        assert resized.size == (500, 500)
-
-    def test_resize_custom_dimensions(self):
-        """Test resize with custom max dimensions."""
-        img = create_test_image(1000, 800)
-
-        resized = resize_image(img, max_width=200, max_height=200)
-
-        assert resized.size[0] == 200
-        assert resized.size[1] == 160  # Maintains aspect ratio
 
+class TestResizeImage:
+    """Tests for resize_image function."""
 
+    @pytest.mark.parametrize(
+        "src_image,max_size,expected",
+        [
+            # Already small enough: unchanged
+            ((500, 400), (1024, 1024), (500, 400)),
+            # Width exceeded: height scaled proportionally
+            ((2000, 1000), (1024, 1024), (1024, 512)),
+            # Height exceeded: width scaled proportionally
+            ((1000, 2000), (1024, 1024), (512, 1024)),
+            # Both exceeded: aspect ratio kept
+            ((3000, 2000), (1024, 1024), (1024, 682)),
+            ((2000, 2000), (500, 500), (500, 500)),
+            ((1000, 800), (200, 200), (200, 160)),
+        ],
+        indirect=["src_image"],
+        ids=["no-change", "width", "height", "both", "square", "custom"],
+    )
+    def test_resize(self, src_image, max_size, expected):
+        """Test that images are scaled down to fit, keeping aspect ratio."""
+        resized = resize_image(src_image, max_width=max_size[0], max_height=max_size[1])
+
+        assert resized.size == expected
+
+
+@pytest.mark.slow
 class TestIntegration:
     """Integration tests for utility functions."""
 
     def test_decode_and_validate_pipeline(self):
         """Test decode -> validate pipeline."""
-        img = create_test_image(500, 500)
-        img_bytes = image_to_bytes(img)
+        img_bytes = create_test_image_bytes(500, 500)
 
         # Decode
         decoded = decode_image(img_bytes)
@@ -252,8 +283,7 @@ class TestIntegration:
 
     def test_decode_resize_pipeline(self):
         """Test decode -> resize pipeline."""
-        img = create_test_image(2000, 1500)
-        img_bytes = image_to_bytes(img)
+        img_bytes = create_test_image_bytes(2000, 1500)
 
         # Decode
         decoded = decode_image(img_bytes)